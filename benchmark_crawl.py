@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Benchmark de los scrapers contra el servidor local de replay (sin tocar salariosperu.com).
+Mide páginas/s, registros/s, MB transferidos, tiempo de CPU y memoria pico por modo de crawl.
+El servidor corre en un proceso aparte: CPU y memoria miden solo al crawler.
+
+Uso:
+  python benchmark_crawl.py
+  python benchmark_crawl.py --companies=200 --latency=0.1 --concurrency=4,8,16
+  python benchmark_crawl.py --archive=archivo_paginas --error-rate=0.02 --json=bench.json
+  python benchmark_crawl.py --parse-workers=4      # Agrega el modo descarga + pool de procesos
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from replay_server import ReplayServer
+from salarios_scraper import SalariosPeruScraper
+from scraper_simple import SalariosScraperSimple
+from throttling import AdaptiveThrottle
+
+
+def _serve(conn, archive_root, options):
+    """Proceso del servidor: atiende peticiones HTTP y responde 'stats' / 'stop' por `conn`"""
+    archive = None
+    if archive_root:
+        from page_archive import PageArchive
+        archive = PageArchive(archive_root)
+    with ReplayServer(archive=archive, **options) as server:
+        conn.send((server.base_url, list(server.pages)))
+        while conn.recv() == 'stats':
+            conn.send(dict(server.stats))
+
+
+class ReplayProcess:
+    """ReplayServer en un proceso hijo, con la misma interfaz que usa el benchmark"""
+
+    def __init__(self, archive=None, **options):
+        self._conn, child = multiprocessing.Pipe()
+        archive_root = str(archive.root) if archive is not None else None
+        self._process = multiprocessing.Process(target=_serve, args=(child, archive_root, options), daemon=True)
+
+    @property
+    def stats(self):
+        self._conn.send('stats')
+        return self._conn.recv()
+
+    def __enter__(self):
+        self._process.start()
+        self.base_url, self.pages = self._conn.recv()
+        return self
+
+    def __exit__(self, *exc):
+        self._conn.send('stop')
+        self._process.join()
+
+
+def run_mode(label, server, crawl):
+    """Ejecuta `crawl()` (retorna cantidad de registros) y mide su costo"""
+    before = server.stats
+    tracemalloc.start()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    records = crawl()
+
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    after = server.stats
+    pages = after['requests'] - before['requests']
+    transferred = after['bytes'] - before['bytes']
+
+    return {
+        'modo': label,
+        'paginas': pages,
+        'registros': records,
+        'segundos': round(wall, 3),
+        'paginas_s': round(pages / wall, 2) if wall else None,
+        'registros_s': round(records / wall, 2) if wall else None,
+        'mb_red': round(transferred / 1024 / 1024, 2),
+        'cpu_s': round(cpu, 3),
+        'memoria_pico_mb': round(peak / 1024 / 1024, 2),
+    }
+
+
+def build_modes(server, concurrency_levels, parse_workers=None):
+    """Modos de crawl a comparar: (nombre, función que retorna registros extraídos)"""
+    companies = [(slug, slug.replace('-', ' ').title()) for slug in server.pages]
+
+    def simple(throttle=None):
+        scraper = SalariosScraperSimple(delay=0, throttle=throttle)
+        scraper.base_url = server.base_url
+        scraper.all_companies = companies
+        scraper.scrape_all_companies()
+        return scraper.records_count
+
+    def peru(concurrency, parse_workers=0):
+        def crawl():
+            scraper = SalariosPeruScraper(delay=0)
+            scraper.base_url = server.base_url
+            scraper.discover_companies()
+            scraper.scrape_all_companies(concurrency=concurrency, rate=1000, parse_workers=parse_workers)
+            return scraper.records_count
+        return crawl
+
+    modes = [
+        ('scraper_simple secuencial', simple),
+        ('scraper_simple adaptativo', lambda: simple(AdaptiveThrottle(rate=20, max_rate=1000, increase=5))),
+        ('salarios_scraper secuencial', peru(1)),
+    ]
+    for level in concurrency_levels:
+        modes.append((f'salarios_scraper async x{level}', peru(level)))
+    if parse_workers:
+        level = max(concurrency_levels, default=4)
+        modes.append((f'pipeline x{level} + {parse_workers} procesos', peru(level, parse_workers)))
+    return modes
+
+
+def main():
+    options = {'companies': 60, 'latency': 0.05, 'error-rate': 0.0, 'rate-429': 0.0}
+    concurrency_levels = [4, 16]
+    archive = None
+    json_path = None
+    parse_workers = None
+
+    for arg in sys.argv[1:]:
+        if arg.startswith('--concurrency='):
+            concurrency_levels = [int(x) for x in arg.split('=', 1)[1].split(',') if x]
+        elif arg.startswith('--archive='):
+            from page_archive import PageArchive
+            # Ruta absoluta: el benchmark corre en un directorio temporal
+            archive = PageArchive(os.path.abspath(arg.split('=', 1)[1]))
+        elif arg.startswith('--json='):
+            json_path = arg.split('=', 1)[1]
+        elif arg.startswith('--parse-workers='):
+            parse_workers = int(arg.split('=', 1)[1]) or os.cpu_count()
+        elif arg.startswith('--') and '=' in arg:
+            key, value = arg[2:].split('=', 1)
+            if key in options:
+                options[key] = type(options[key])(value)
+
+    # Los logs por empresa distorsionan los tiempos
+    logging.getLogger().setLevel(logging.WARNING)
+
+    server = ReplayProcess(archive=archive, companies=options['companies'], latency=options['latency'],
+                           error_rate=options['error-rate'], rate_429=options['rate-429'], seed=42)
+    results = []
+    # Los scrapers escriben en el directorio actual (p. ej. discover_companies deja
+    # empresas_encontradas.txt): se corre en uno temporal para no pisar los datos reales
+    cwd = os.getcwd()
+    with server, tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            print(f"Benchmark contra {server.base_url}: {len(server.pages)} empresas, "
+                  f"latencia {options['latency']}s")
+            print("=" * 100)
+            print(f"{'Modo':<32} {'Paginas':>8} {'Registros':>10} {'Seg':>8} {'Pag/s':>8} "
+                  f"{'Reg/s':>9} {'MB red':>8} {'CPU s':>8} {'Mem MB':>8}")
+            for label, crawl in build_modes(server, concurrency_levels, parse_workers):
+                r = run_mode(label, server, crawl)
+                results.append(r)
+                print(f"{r['modo']:<32} {r['paginas']:>8} {r['registros']:>10} {r['segundos']:>8} "
+                      f"{r['paginas_s']:>8} {r['registros_s']:>9} {r['mb_red']:>8} {r['cpu_s']:>8} "
+                      f"{r['memoria_pico_mb']:>8}")
+        finally:
+            os.chdir(cwd)
+
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({'opciones': options, 'resultados': results}, f, ensure_ascii=False, indent=2)
+        print(f"\nResultados guardados en {json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Estado de salud de las empresas de SalariosPerú.com
+verify_companies revisa la lista completa en paralelo (hilos acotados y, por
+defecto, el ritmo cortés de los scrapers) con peticiones livianas: HEAD, o un GET con Range que deja
+de leer apenas aparece un puesto con salario, en lugar de descargar y parsear
+cada página. El resultado de cada slug queda en SQLite (CompanyHealth) y los
+scrapers descartan con exclude_dead las empresas que dejaron de existir
+cuando cargan la lista desde el registro (nunca las que lista el sitemap).
+
+Estados: 'ok' (página con salarios), 'sin_datos' (la página existe pero no se
+vieron salarios), 'muerta' (404/410) y 'error' (red, otros 4xx como un
+bloqueo 401/403, 5xx o redirección fuera de /empresa/: no cuenta para
+marcarla como muerta).
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+
+import requests
+
+from company_slugs import BASE_URL, canonical_slug, company_url
+from crawl_state import utc_now
+from http_transport import HttpTransport
+from throttling import AdaptiveThrottle
+
+logger = logging.getLogger(__name__)
+
+HEALTH_DB = 'company_health.db'
+
+OK, NO_DATA, DEAD, ERROR = 'ok', 'sin_datos', 'muerta', 'error'
+
+# Indicadores de salarios; en las páginas de empresa el JSON-LD va en el <head>
+SALARY_MARKERS = (b'JobPosting', b'S/')
+PROBE_BYTES = 64 * 1024
+
+
+class CompanyHealth:
+    """Último resultado de verificación de cada slug canónico
+
+    `failures` cuenta verificaciones 'muerta' consecutivas; con `dead_after`
+    o más la empresa se considera muerta. Un resultado 'ok' o 'sin_datos' la
+    rehabilita; un 'error' no cambia el conteo.
+    """
+
+    def __init__(self, db_path=HEALTH_DB, dead_after=2):
+        self.db_path = db_path
+        self.dead_after = dead_after
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS company_health (
+                slug TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                http_status INTEGER,
+                failures INTEGER NOT NULL DEFAULT 0,
+                checked_at TEXT NOT NULL,
+                last_ok TEXT
+            )
+            """)
+            self.conn.commit()
+
+    def record(self, slug, status, http_status=None):
+        """Guarda el resultado de una verificación"""
+        now = utc_now()
+        failures = 1 if status == DEAD else 0
+        with self._lock:
+            self.conn.execute("""
+            INSERT INTO company_health (slug, status, http_status, failures, checked_at, last_ok)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(slug) DO UPDATE SET
+                status = excluded.status,
+                http_status = excluded.http_status,
+                failures = CASE
+                    WHEN excluded.status = 'muerta' THEN company_health.failures + 1
+                    WHEN excluded.status = 'error' THEN company_health.failures
+                    ELSE 0 END,
+                checked_at = excluded.checked_at,
+                last_ok = COALESCE(excluded.last_ok, company_health.last_ok)
+            """, (canonical_slug(slug), status, http_status, failures, now, now if status == OK else None))
+            self.conn.commit()
+
+    def status(self, slug):
+        """(estado, código HTTP, fallos consecutivos, checked_at) o None si nunca se verificó"""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT status, http_status, failures, checked_at FROM company_health WHERE slug = ?",
+                (canonical_slug(slug),)
+            ).fetchone()
+
+    def dead_slugs(self):
+        with self._lock:
+            return {slug for (slug,) in self.conn.execute(
+                "SELECT slug FROM company_health WHERE failures >= ?", (self.dead_after,)
+            )}
+
+    def exclude_dead(self, companies):
+        """`companies` (slugs o tuplas (slug, nombre)) sin las empresas muertas"""
+        dead = self.dead_slugs()
+        if not dead:
+            return companies
+        alive = [c for c in companies if canonical_slug(c[0] if isinstance(c, tuple) else c) not in dead]
+        if len(alive) < len(companies):
+            logger.info(f"Se omiten {len(companies) - len(alive)} empresas muertas según {self.db_path}")
+        return alive
+
+    def summary(self):
+        """{estado: cantidad de slugs}"""
+        with self._lock:
+            return dict(self.conn.execute("SELECT status, COUNT(*) FROM company_health GROUP BY status"))
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def exclude_dead(companies, db_path=HEALTH_DB):
+    """Quita las empresas muertas si hay una base de salud en `db_path`; si no, retorna `companies` tal cual"""
+    if not os.path.exists(db_path):
+        return companies
+    health = CompanyHealth(db_path)
+    try:
+        return health.exclude_dead(companies)
+    finally:
+        health.close()
+
+
+def _classify(response, content=None):
+    """Estado de una respuesta ya recibida (content=None para HEAD)"""
+    status = response.status_code
+    if status in (404, 410):
+        return DEAD
+    if status not in (200, 206):
+        # 401/403 suelen ser un bloqueo (WAF, anti-bots), no una empresa que dejó de existir
+        return ERROR
+    if '/empresa/' not in urlsplit(response.url).path:
+        # Redirección a otra página (portada, login, captcha): no alcanza para darla por muerta
+        return ERROR
+    if content is None:
+        return OK
+    return OK if any(marker in content for marker in SALARY_MARKERS) else NO_DATA
+
+
+def probe_company(url, transport, method='range', probe_bytes=PROBE_BYTES, timeout=10):
+    """Verifica una página de empresa; retorna (estado, respuesta o None)
+
+    method='head' solo mira el estado HTTP (si el servidor no acepta HEAD se
+    usa 'range'). method='range' pide los primeros `probe_bytes` sin
+    compresión y corta la lectura en cuanto aparece un indicador de salarios.
+    """
+    try:
+        if method == 'head':
+            response = transport.head(url, timeout=timeout)
+            if response.status_code not in (405, 501):
+                return _classify(response), response
+
+        headers = {'Range': f'bytes=0-{probe_bytes - 1}', 'Accept-Encoding': 'identity'}
+        response = transport.get(
+            url, headers=headers, timeout=timeout,
+            stop=lambda body: len(body) >= probe_bytes or any(m in body for m in SALARY_MARKERS)
+        )
+    except requests.RequestException as e:
+        logger.debug(f"Error verificando {url}: {e}")
+        return ERROR, None
+    return _classify(response, response.content), response
+
+
+def verify_companies(companies, health=None, workers=16, method='range', throttle=None,
+                     transport=None, base_url=BASE_URL, on_result=None, rate=0.5, max_rate=None):
+    """Verifica en paralelo `companies` (slugs o tuplas (slug, nombre))
+
+    Sin `throttle` las peticiones van a `rate` por segundo (por defecto una
+    cada 2 s, como los scrapers) sin importar cuántos hilos haya; con
+    `max_rate` el ritmo sube de forma adaptativa hasta ese tope. Con `health`
+    (CompanyHealth) cada resultado se persiste. `on_result(slug, estado,
+    código)` se llama a medida que terminan. Retorna {slug: estado}.
+    """
+    transport = transport or HttpTransport(pool_size=workers)
+    throttle = throttle or AdaptiveThrottle(rate=rate, max_rate=max(max_rate or rate, rate))
+
+    def check(company):
+        slug = canonical_slug(company[0] if isinstance(company, tuple) else company)
+        throttle.wait()
+        status, response = probe_company(company_url(slug, base_url), transport, method)
+        throttle.observe(response)
+        http_status = response.status_code if response is not None else None
+        if health:
+            health.record(slug, status, http_status)
+        return slug, status, http_status
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(check, company) for company in companies]
+        for future in as_completed(futures):
+            slug, status, http_status = future.result()
+            results[slug] = status
+            if on_result:
+                on_result(slug, status, http_status)
+    counts = Counter(results.values())
+    logger.info(f"Verificadas {len(results)} empresas ({workers} hilos, {method}): "
+                + ', '.join(f"{counts[s]} {s}" for s in (OK, NO_DATA, DEAD, ERROR)))
+    return results
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Registro de empresas de SalariosPerú.com
+La lista de empresas vive en un archivo de datos compacto (empresas.json,
+una fila [slug, nombre, sector] por empresa) en lugar de un módulo Python
+con una lista literal: importar un scraper ya no compila miles de tuplas y
+el archivo solo se lee la primera vez que se pide una empresa.
+
+Al cargar se arman índices por slug, por nombre y por sector, así que
+get_companies_by_sector es una búsqueda en un dict y no un recorrido.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+
+from company_slugs import canonical_slug, dedupe_companies
+
+REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'empresas.json')
+
+# Sector por palabras clave en el nombre o el slug; gana la primera regla que coincide
+SECTOR_KEYWORDS = (
+    ('bancos', ('banco', 'financiera', 'credicorp', 'caja-', 'caja ')),
+    ('seguros', ('seguro',)),
+    ('telecomunicaciones', ('entel', 'telefónica', 'claro')),
+    ('retail', ('falabella', 'ripley', 'sodimac', 'hiraoka')),
+    ('tecnologia', ('software', 'tech', 'sistemas')),
+)
+DEFAULT_SECTOR = 'otros'
+
+
+def sector_of(slug, name):
+    """Sector de una empresa según SECTOR_KEYWORDS (DEFAULT_SECTOR si ninguna coincide)"""
+    text = f"{slug} {name}".lower()
+    for sector, words in SECTOR_KEYWORDS:
+        if any(word in text for word in words):
+            return sector
+    return DEFAULT_SECTOR
+
+
+class CompanyRegistry:
+    """Empresas (slug, nombre) con índices por slug, nombre y sector
+
+    Con `path` el archivo se lee de forma perezosa en el primer acceso; con
+    `companies` (tuplas (slug, nombre) o (slug, nombre, sector)) se arma en
+    memoria. Los slugs se canonicalizan y se quitan duplicados.
+    """
+
+    def __init__(self, path=REGISTRY_PATH, companies=None):
+        self.path = path
+        self.generated_at = None
+        self._rows = None
+        self._pending = companies
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._rows is not None:
+            return self._rows
+        with self._lock:
+            if self._rows is None:
+                if self._pending is not None:
+                    rows = self._pending
+                else:
+                    with open(self.path, encoding='utf-8') as f:
+                        data = json.load(f)
+                    self.generated_at = data.get('generated_at')
+                    rows = data['empresas']
+                self._index(rows)
+        return self._rows
+
+    def _index(self, rows):
+        self._by_slug = {}
+        self._by_name = {}
+        self._by_sector = {}
+        result = []
+        for row in dedupe_companies([tuple(row) for row in rows]):
+            slug, name = row[0], row[1]
+            sector = row[2] if len(row) > 2 and row[2] else sector_of(slug, name)
+            company = (slug, name)
+            self._by_slug[slug] = (name, sector)
+            self._by_name.setdefault(name.lower(), company)
+            self._by_sector.setdefault(sector, []).append(company)
+            result.append(company)
+        self._pending = None
+        self._rows = result
+
+    @property
+    def loaded(self):
+        return self._rows is not None
+
+    def available(self):
+        """True si el registro tiene datos (en memoria o en el archivo)"""
+        return self._rows is not None or self._pending is not None or os.path.exists(self.path)
+
+    def all(self):
+        """Lista de (slug, nombre) en el orden del archivo"""
+        return list(self._load())
+
+    def __len__(self):
+        return len(self._load())
+
+    def __contains__(self, slug):
+        self._load()
+        return canonical_slug(slug) in self._by_slug
+
+    def get(self, slug):
+        """(slug, nombre) de un slug (con o sin codificar), o None"""
+        self._load()
+        slug = canonical_slug(slug)
+        entry = self._by_slug.get(slug)
+        return (slug, entry[0]) if entry else None
+
+    def find_by_name(self, name):
+        """(slug, nombre) por nombre exacto sin distinguir mayúsculas, o None"""
+        self._load()
+        return self._by_name.get(name.strip().lower())
+
+    def sector(self, slug):
+        self._load()
+        entry = self._by_slug.get(canonical_slug(slug))
+        return entry[1] if entry else None
+
+    def sectors(self):
+        """{sector: cantidad de empresas}"""
+        self._load()
+        return {sector: len(companies) for sector, companies in self._by_sector.items()}
+
+    def by_sector(self, sector):
+        self._load()
+        return list(self._by_sector.get(sector, ()))
+
+    def with_special_chars(self):
+        """Empresas cuyo slug tiene tildes, ñ u otros caracteres no ASCII"""
+        return [c for c in self._load() if not c[0].isascii()]
+
+
+def write_registry(companies, path=REGISTRY_PATH):
+    """Escribe el registro (lista de (slug, nombre)) ordenado por nombre; retorna cuántas empresas guardó
+
+    Una fila por línea para que los cambios entre actualizaciones se lean en un diff.
+    """
+    companies = sorted(dedupe_companies(companies), key=lambda c: c[1].lower())
+    header = json.dumps({'generated_at': datetime.now().isoformat(timespec='seconds'),
+                         'total': len(companies)}, ensure_ascii=False)[:-1]
+    rows = ',\n'.join(
+        json.dumps([slug, name, sector_of(slug, name)], ensure_ascii=False, separators=(',', ':'))
+        for slug, name, *_ in companies
+    )
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(f'{header}, "empresas": [\n{rows}\n]}}\n')
+    os.replace(tmp, path)
+    return len(companies)
+
+
+_registry = None
+
+
+def get_registry():
+    """Registro compartido del proceso (empresas.json), cargado en el primer uso"""
+    global _registry
+    if _registry is None:
+        _registry = CompanyRegistry()
+    return _registry
+
+
+def get_empresas_auto():
+    """Lista completa de empresas (slug, nombre) del registro"""
+    return get_registry().all()
+
+
+def get_companies_by_sector(sector):
+    """Empresas del registro de un sector ('bancos', 'seguros', 'retail', ...)"""
+    return get_registry().by_sector(sector)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Slugs de empresas de SalariosPerú.com
+Un mismo slug llega con tildes ('entel-perú'), percent-encoded desde el
+sitemap ('entel-per%C3%BA'), a veces doblemente codificado o en Unicode
+descompuesto (NFD). canonical_slug los reduce a una sola forma para que una
+empresa no se visite dos veces, y company_url la codifica una sola vez.
+
+SlugCache guarda en SQLite el nombre real y la URL de cada slug canónico,
+compartido por todos los crawlers: un refresco solo resuelve nombres de
+slugs que nunca vio.
+"""
+
+import sqlite3
+import threading
+import unicodedata
+from urllib.parse import quote, unquote
+
+from crawl_state import utc_now
+
+BASE_URL = "https://salariosperu.com"
+
+
+def canonical_slug(slug):
+    """Forma canónica: decodificada (incluso si venía codificada varias veces), NFC y sin '/' en los bordes"""
+    slug = slug.strip().strip('/')
+    for _ in range(3):
+        decoded = unquote(slug)
+        if decoded == slug:
+            break
+        slug = decoded
+    return unicodedata.normalize('NFC', slug)
+
+
+def company_url(slug, base_url=BASE_URL):
+    """URL de la página de la empresa, con el slug codificado exactamente una vez"""
+    return f"{base_url}/empresa/{quote(canonical_slug(slug), safe='-.')}"
+
+
+def has_special_chars(slug):
+    """True si el slug canónico tiene tildes, ñ u otros caracteres no ASCII"""
+    return not canonical_slug(slug).isascii()
+
+
+def slug_to_name(slug):
+    """Convierte un slug a un nombre legible (fallback cuando no se conoce el nombre real)"""
+    name = canonical_slug(slug)
+    # Manejar sufijos comunes
+    name = name.replace('-s-a-', ' S.A.')
+    name = name.replace('-s.a.', ' S.A.')
+    name = name.replace('-sac', ' SAC')
+    name = name.replace('-saa', ' SAA')
+    name = name.replace('-s-a-c-', ' S.A.C.')
+    name = name.replace('-', ' ')
+    # Capitalizar cada palabra
+    return name.title()
+
+
+def dedupe_companies(companies):
+    """Canonicaliza los slugs de (slug, nombre) o slugs y quita duplicados, conservando el primero"""
+    seen = set()
+    result = []
+    for company in companies:
+        if isinstance(company, tuple):
+            slug = canonical_slug(company[0])
+            item = (slug, *company[1:])
+        else:
+            slug = item = canonical_slug(company)
+        if slug not in seen:
+            seen.add(slug)
+            result.append(item)
+    return result
+
+
+class SlugCache:
+    """Cache persistente slug canónico -> (nombre, URL, origen del nombre)
+
+    El origen es 'pagina' si el nombre salió de la página de la empresa
+    (JSON-LD o <title>) y 'slug' si es el derivado de slug_to_name; solo los
+    primeros cuentan como resueltos.
+    """
+
+    def __init__(self, db_path='slug_cache.db'):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS slugs (
+                slug TEXT PRIMARY KEY,
+                name TEXT,
+                url TEXT NOT NULL,
+                source TEXT,
+                updated_at TEXT NOT NULL
+            )
+            """)
+            self.conn.commit()
+
+    def put(self, slug, name, source='pagina', base_url=BASE_URL):
+        """Guarda el nombre de un slug; un nombre derivado del slug no pisa uno real"""
+        slug = canonical_slug(slug)
+        with self._lock:
+            self.conn.execute("""
+            INSERT INTO slugs (slug, name, url, source, updated_at) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(slug) DO UPDATE SET
+                name = excluded.name, url = excluded.url, source = excluded.source,
+                updated_at = excluded.updated_at
+            WHERE excluded.source = 'pagina' OR slugs.source != 'pagina'
+            """, (slug, name, company_url(slug, base_url), source, utc_now()))
+            self.conn.commit()
+
+    def name(self, slug):
+        """Nombre guardado para el slug (None si no hay)"""
+        with self._lock:
+            row = self.conn.execute("SELECT name FROM slugs WHERE slug = ?", (canonical_slug(slug),)).fetchone()
+        return row[0] if row else None
+
+    def names(self):
+        """{slug: nombre} de todos los slugs guardados"""
+        with self._lock:
+            return dict(self.conn.execute("SELECT slug, name FROM slugs"))
+
+    def unresolved(self, slugs):
+        """Slugs (canónicos, en orden) sin nombre real resuelto desde su página"""
+        with self._lock:
+            resolved = {slug for (slug,) in self.conn.execute("SELECT slug FROM slugs WHERE source = 'pagina'")}
+        return [slug for slug in dedupe_companies(slugs) if slug not in resolved]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Métricas de crawl para los scrapers de SalariosPerú.com
+Tiempos por etapa de cada petición (espera en cola, conexión, TTFB, descarga
+y parseo) y contadores (bytes, registros, hits de cache, reintentos, fallos)
+por método de extracción. Se exportan como archivo de texto Prometheus
+(para el textfile collector de node_exporter) y como resumen JSON del run.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+STAGES = ('queue_wait', 'connect', 'ttfb', 'download', 'parse')
+
+# Límites (segundos) de los buckets del histograma de cada etapa
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+HELP = {
+    'stage_seconds': 'Tiempo por etapa de cada petición',
+    'pages_total': 'Páginas parseadas por método de extracción',
+    'records_total': 'Registros extraídos por método de extracción',
+    'failures_total': 'Empresas fallidas por motivo',
+    'cache_hits_total': 'Empresas resueltas sin parsear (304 o contenido sin cambios)',
+    'bytes_total': 'Bytes recibidos (wire: comprimidos, body: descomprimidos)',
+}
+
+
+class StageTimer:
+    """Histograma acumulado de duraciones de una etapa"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'sum': round(self.total, 4),
+            'avg': round(self.total / self.count, 4) if self.count else None,
+            'max': round(self.max, 4),
+        }
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key):
+    if not key:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in key) + '}'
+
+
+def _write_atomic(path, text):
+    """Escribe vía archivo temporal + rename, para que el lector nunca vea un archivo a medias"""
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+class CrawlMetrics:
+    """Tiempos por etapa y contadores de un run, seguros entre hilos"""
+
+    def __init__(self, prefix='salarios_crawl'):
+        self.prefix = prefix
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self._stages = {stage: StageTimer() for stage in STAGES}
+        self._counters = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        """Registra la duración de una etapa (ver STAGES)"""
+        with self._lock:
+            self._stages.setdefault(stage, StageTimer()).observe(max(0.0, seconds))
+
+    @contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def inc(self, name, amount=1, **labels):
+        """Suma `amount` al contador `name` con las etiquetas dadas"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def set_gauge(self, name, value, **labels):
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = value
+
+    def observe_response(self, response):
+        """Etapas de red y bytes de una respuesta leída por HttpTransport"""
+        connect = getattr(response, 'connect_seconds', 0.0)
+        headers = response.elapsed.total_seconds()
+        self.observe('connect', connect)
+        self.observe('ttfb', headers - connect)
+        self.observe('download', response.download_seconds - headers)
+        self.inc('bytes_total', response.wire_bytes, kind='wire')
+        self.inc('bytes_total', response.body_bytes, kind='body')
+
+    def record_parse(self, method, records, seconds):
+        """Registra un parseo: `method` es 'jsonld', 'nextjs', 'html' o None (sin registros)"""
+        method = method or 'ninguno'
+        self.observe('parse', seconds)
+        self.inc('pages_total', method=method)
+        self.inc('records_total', len(records), method=method)
+
+    def absorb(self, name, stats):
+        """Copia como gauges las métricas de otro componente (throttle, retry_policy, transporte)"""
+        for key, value in stats.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                self.set_gauge(f'{name}_{key}', value)
+
+    def counter(self, name, **labels):
+        with self._lock:
+            return self._counters.get((name, _label_key(labels)), 0)
+
+    def summary(self):
+        """Resumen del run como dict serializable a JSON"""
+        with self._lock:
+            counters = {}
+            for (name, key), value in sorted(self._counters.items()):
+                label = ','.join(f'{k}={v}' for k, v in key)
+                counters.setdefault(name, {})[label or 'total'] = value
+            return {
+                'started_at': self.started_at.isoformat(),
+                'finished_at': datetime.now().isoformat(),
+                'duration_seconds': round(time.perf_counter() - self._start, 3),
+                'stages': {stage: timer.summary() for stage, timer in self._stages.items()},
+                'counters': counters,
+                'gauges': {name + _format_labels(key): value for (name, key), value in sorted(self._gauges.items())},
+            }
+
+    def prometheus_text(self):
+        """Métricas en el formato de texto de Prometheus"""
+        p = self.prefix
+        lines = []
+        with self._lock:
+            lines.append(f'# HELP {p}_stage_seconds {HELP["stage_seconds"]}')
+            lines.append(f'# TYPE {p}_stage_seconds histogram')
+            for stage, timer in self._stages.items():
+                for bound, count in zip(BUCKETS, timer.buckets):
+                    lines.append(f'{p}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'{p}_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {timer.count}')
+                lines.append(f'{p}_stage_seconds_sum{{stage="{stage}"}} {timer.total:.6f}')
+                lines.append(f'{p}_stage_seconds_count{{stage="{stage}"}} {timer.count}')
+
+            for kind, values in (('counter', self._counters), ('gauge', self._gauges)):
+                by_name = {}
+                for (name, key), value in sorted(values.items()):
+                    by_name.setdefault(name, []).append((key, value))
+                for name, samples in by_name.items():
+                    if name in HELP:
+                        lines.append(f'# HELP {p}_{name} {HELP[name]}')
+                    lines.append(f'# TYPE {p}_{name} {kind}')
+                    lines.extend(f'{p}_{name}{_format_labels(key)} {value}' for key, value in samples)
+
+            lines.append(f'# TYPE {p}_duration_seconds gauge')
+            lines.append(f'{p}_duration_seconds {time.perf_counter() - self._start:.3f}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        _write_atomic(path, self.prometheus_text())
+
+    def write_json(self, path):
+        _write_atomic(path, json.dumps(self.summary(), ensure_ascii=False, indent=2) + '\n')
+
+    def export(self, basename):
+        """Escribe `basename`.prom y `basename`.json; retorna las dos rutas"""
+        prom, summary = f'{basename}.prom', f'{basename}.json'
+        self.write_prometheus(prom)
+        self.write_json(summary)
+        return prom, summary
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Pipeline de crawl en dos etapas para los scrapers de SalariosPerú.com
+Las descargas (I/O) corren en hilos coordinados por asyncio y entregan los
+bytes, a través de una cola acotada, a un pool de procesos que parsea las
+páginas (CPU). El parseo deja de competir por el GIL con las descargas y
+escala con los núcleos; la cola limita cuántas páginas esperan en memoria.
+
+iter_in_thread convierte un crawl que entrega resultados por callback en un
+generador con backpressure, para consumirlo mientras corre.
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+def run_pipeline(jobs, fetch, parse, deliver, concurrency=8, parse_workers=None, queue_size=None):
+    """Descarga y parsea `jobs`; retorna la lista de jobs cuya descarga falló
+
+    fetch(job): bloqueante, corre en un hilo. Retorna None si la descarga
+        falló, una lista de registros si no hace falta parsear (p. ej. 304),
+        o una tupla (args, contexto) para ejecutar parse(*args) en el pool.
+        Si lanza una excepción, el job cuenta como fallido.
+    parse(*args): función de módulo (picklable) que retorna los registros.
+    deliver(job, registros, contexto): corre en el hilo del event loop, en el
+        orden en que terminan los parseos (contexto es None si no se parseó).
+    """
+    return asyncio.run(_pipeline(jobs, fetch, parse, deliver, concurrency, parse_workers, queue_size))
+
+
+async def _pipeline(jobs, fetch, parse, deliver, concurrency, parse_workers, queue_size):
+    parse_workers = parse_workers or os.cpu_count() or 1
+    queue = asyncio.Queue(maxsize=queue_size or parse_workers * 2)
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    failed = []
+
+    async def fetcher(job):
+        # El semáforo se libera recién al encolar: como máximo `concurrency`
+        # páginas descargadas esperan un lugar en la cola
+        async with semaphore:
+            try:
+                result = await asyncio.to_thread(fetch, job)
+            except Exception as e:
+                # Un job que falla no debe abortar el gather de todo el crawl
+                logger.error(f"Error descargando {job}: {e}")
+                result = None
+            if result is None:
+                failed.append(job)
+            elif isinstance(result, list):
+                deliver(job, result, None)
+            else:
+                await queue.put((job, result))
+
+    async def parser(pool):
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            job, (args, context) = item
+            try:
+                records = await loop.run_in_executor(pool, parse, *args)
+            except Exception as e:
+                logger.error(f"Error parseando {job}: {e}")
+                failed.append(job)
+                continue
+            deliver(job, records, context)
+
+    with ProcessPoolExecutor(max_workers=parse_workers) as pool:
+        parsers = [asyncio.create_task(parser(pool)) for _ in range(parse_workers)]
+        try:
+            await asyncio.gather(*(fetcher(job) for job in jobs))
+        finally:
+            for _ in parsers:
+                await queue.put(None)
+            await asyncio.gather(*parsers)
+
+    return failed
+
+
+_DONE = object()
+
+
+def iter_in_thread(produce, max_pending=8):
+    """Ejecuta produce(emit, stop) en un hilo y genera cada valor que pase a emit()
+
+    emit bloquea mientras haya `max_pending` valores sin consumir, así que un
+    consumidor lento frena al crawl en vez de acumular en memoria. Si el
+    consumidor deja de iterar, se activa `stop` (threading.Event): emit pasa a
+    descartar y produce debería terminar cuanto antes. Las excepciones de
+    produce se relanzan en el consumidor.
+    """
+    outbox = queue.Queue(maxsize=max_pending)
+    stop = threading.Event()
+    errors = []
+
+    def emit(value):
+        if not stop.is_set():
+            outbox.put(value)
+
+    def run():
+        try:
+            produce(emit, stop)
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            outbox.put(_DONE)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    try:
+        while True:
+            value = outbox.get()
+            if value is _DONE:
+                break
+            yield value
+    finally:
+        stop.set()
+        # Vaciar la cola para liberar un emit() bloqueado y esperar a que produce termine
+        while thread.is_alive() or not outbox.empty():
+            try:
+                if outbox.get(timeout=0.1) is _DONE:
+                    break
+            except queue.Empty:
+                pass
+        thread.join()
+    if errors:
+        raise errors[0]
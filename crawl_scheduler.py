@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Planificador de crawl según la frecuencia de cambio de cada empresa
+Estima, con el historial de CrawlState, cuántas veces por día cambia el
+contenido de cada empresa y ordena las visitas por la probabilidad de que la
+página haya cambiado desde el último crawl. Con un presupuesto (peticiones o
+segundos) solo se visitan las más probables: las empresas que cambian seguido
+(bancos, Yape, Rappi...) se refrescan primero y las estáticas esperan.
+"""
+
+import logging
+import math
+from datetime import datetime, timezone
+
+from crawl_state import parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_change_rate(intervals, interval_days, changes, default_rate):
+    """Cambios por día estimados a partir de `intervals` crawls con `changes` cambios detectados
+
+    Un crawl solo ve si hubo al menos un cambio en el intervalo, no cuántos;
+    el estimador de Cho y Garcia-Molina corrige ese sesgo (con +0.5 para que
+    sea finito si todos los intervalos tuvieron cambios). Sin historial
+    retorna `default_rate`.
+    """
+    if intervals <= 0 or interval_days <= 0:
+        return default_rate
+    mean_interval = interval_days / intervals
+    changes = min(changes, intervals)
+    return -math.log((intervals - changes + 0.5) / (intervals + 0.5)) / mean_interval
+
+
+class ChangeRateScheduler:
+    """Ordena y recorta la lista de empresas según su probabilidad de haber cambiado
+
+    Prioridad de una empresa: 1 - exp(-tasa * días_desde_el_último_crawl).
+    Las empresas nunca extraídas tienen prioridad 1 (van primero).
+    `default_rate` (cambios/día) se usa para empresas sin historial suficiente;
+    `min_rate` evita que una empresa que nunca cambió quede sin visitar para siempre.
+    """
+
+    def __init__(self, crawl_state, default_rate=1 / 7, min_rate=1 / 90):
+        self.crawl_state = crawl_state
+        self.default_rate = default_rate
+        self.min_rate = min_rate
+
+    def priorities(self, slugs, now=None):
+        """Retorna {slug: (prioridad, tasa)}"""
+        now = now or datetime.now(timezone.utc)
+        history = self.crawl_state.change_history()
+        result = {}
+        for slug in slugs:
+            last_crawled, intervals, interval_days, changes = history.get(slug, (None, 0, 0.0, 0))
+            rate = max(self.min_rate, estimate_change_rate(intervals, interval_days, changes, self.default_rate))
+            crawled = parse_timestamp(last_crawled)
+            if crawled is None:
+                result[slug] = (1.0, rate)
+                continue
+            age_days = max(0.0, (now - crawled).total_seconds() / 86400)
+            result[slug] = (1.0 - math.exp(-rate * age_days), rate)
+        return result
+
+    def plan(self, companies, max_requests=None, time_budget=None, seconds_per_request=None, now=None):
+        """Retorna `companies` (slugs o tuplas (slug, nombre)) en orden de prioridad
+
+        Con max_requests y/o time_budget (segundos, convertido con
+        `seconds_per_request`) se recorta al presupuesto más estricto. El orden
+        es estable: a igual prioridad se respeta el orden original.
+        """
+        slugs = [c[0] if isinstance(c, tuple) else c for c in companies]
+        priorities = self.priorities(slugs, now)
+        order = sorted(range(len(companies)), key=lambda i: -priorities[slugs[i]][0])
+        planned = [companies[i] for i in order]
+
+        budget = max_requests
+        if time_budget and seconds_per_request:
+            by_time = int(time_budget / seconds_per_request)
+            budget = by_time if budget is None else min(budget, by_time)
+        if budget is not None and budget < len(planned):
+            skipped = planned[budget:]
+            planned = planned[:budget]
+            expected = sum(priorities[c[0] if isinstance(c, tuple) else c][0] for c in skipped)
+            logger.info(f"Presupuesto de {budget} visitas: se posponen {len(skipped)} empresas "
+                        f"(~{expected:.1f} cambios esperados entre ellas)")
+        return planned
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Crawl repartido en shards para los scrapers de SalariosPerú.com
+- shard_of: asigna cada slug a uno de N shards con hashing consistente
+  (jump consistent hash): cambiar N mueve solo ~1/N de las empresas.
+- ShardLeases: tabla de leases en un SQLite compartido (carpeta de red o
+  disco común) para que cada nodo tome un shard distinto sin un broker; un
+  lease vencido (nodo caído) puede tomarlo otro nodo.
+- merge_partitions: combina las particiones SQLite de cada shard en los
+  sinks de salida canónicos.
+"""
+
+import hashlib
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+from record_sinks import COLUMNS
+
+logger = logging.getLogger(__name__)
+
+
+def jump_hash(key, buckets):
+    """Jump consistent hash (Lamping y Veach): entero de 64 bits -> bucket en [0, buckets)"""
+    b, j = -1, 0
+    while j < buckets:
+        b = j
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        j = int((b + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+    return b
+
+
+def shard_of(slug, shards):
+    """Shard (0..shards-1) al que pertenece `slug`; estable entre procesos y máquinas"""
+    digest = hashlib.blake2b(slug.encode('utf-8'), digest_size=8).digest()
+    return jump_hash(int.from_bytes(digest, 'big'), shards)
+
+
+def parse_shard(value):
+    """'i/N' -> (i, N), con i en 0..N-1; 'auto/N' -> (None, N)"""
+    index, _, total = value.partition('/')
+    total = int(total)
+    if total < 1:
+        raise ValueError(f"Número de shards inválido: {value}")
+    if index == 'auto':
+        return None, total
+    index = int(index)
+    if not 0 <= index < total:
+        raise ValueError(f"Shard fuera de rango: {value} (usa 0..{total - 1})")
+    return index, total
+
+
+def filter_shard(companies, index, total):
+    """Empresas (slugs o tuplas (slug, nombre)) que le tocan al shard `index` de `total`"""
+    return [c for c in companies if shard_of(c[0] if isinstance(c, tuple) else c, total) == index]
+
+
+def default_owner():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class ShardLeases:
+    """Leases de shards en SQLite: un shard lo procesa un solo nodo a la vez
+
+    Cada lease vence a los `ttl` segundos salvo que se renueve; hold() lo
+    renueva en un hilo mientras dura el crawl (si otro nodo se lo queda, avisa
+    con on_lost para cortar el crawl). Al terminar se marca como
+    finalizado con la cantidad de registros, y merge lo consulta.
+    """
+
+    def __init__(self, db_path='shards.db', ttl=300.0):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS shard_leases (
+                total INTEGER NOT NULL,
+                shard INTEGER NOT NULL,
+                owner TEXT,
+                expires_at REAL,
+                finished_at REAL,
+                records INTEGER,
+                PRIMARY KEY (total, shard)
+            )
+            """)
+
+    def acquire(self, shard, total, owner=None):
+        """Toma el lease del shard si está libre, vencido o ya es de `owner`; retorna True/False"""
+        owner = owner or default_owner()
+        now = time.time()
+        with self._lock:
+            # BEGIN IMMEDIATE: toma el lock de escritura antes de leer, así dos nodos no ganan a la vez
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.conn.execute(
+                    "SELECT owner, expires_at, finished_at FROM shard_leases WHERE total = ? AND shard = ?",
+                    (total, shard)
+                ).fetchone()
+                if row and row[2] is None and row[0] != owner and row[1] > now:
+                    self.conn.execute("ROLLBACK")
+                    return False
+                self.conn.execute("""
+                INSERT INTO shard_leases (total, shard, owner, expires_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(total, shard) DO UPDATE SET
+                    owner = excluded.owner, expires_at = excluded.expires_at,
+                    finished_at = NULL, records = NULL
+                """, (total, shard, owner, now + self.ttl))
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        if row and row[2] is None and row[0] != owner:
+            logger.warning(f"Lease del shard {shard}/{total} vencido (era de {row[0]}), tomado por {owner}")
+        return True
+
+    def acquire_any(self, total, owner=None):
+        """Toma el primer shard no finalizado y sin lease vigente; None si no queda ninguno"""
+        finished = {shard for shard, state in self.status(total).items() if state['finished']}
+        for shard in range(total):
+            if shard not in finished and self.acquire(shard, total, owner):
+                return shard
+        return None
+
+    def renew(self, shard, total, owner=None):
+        """Extiende el lease; retorna False si otro nodo se lo quedó"""
+        owner = owner or default_owner()
+        with self._lock:
+            cursor = self.conn.execute(
+                "UPDATE shard_leases SET expires_at = ? WHERE total = ? AND shard = ? AND owner = ?",
+                (time.time() + self.ttl, total, shard, owner)
+            )
+        return cursor.rowcount == 1
+
+    def finish(self, shard, total, records, owner=None):
+        """Marca el shard como completado; retorna False si el lease ya no es de `owner`"""
+        owner = owner or default_owner()
+        with self._lock:
+            cursor = self.conn.execute(
+                "UPDATE shard_leases SET finished_at = ?, records = ?, expires_at = NULL "
+                "WHERE total = ? AND shard = ? AND owner = ?",
+                (time.time(), records, total, shard, owner)
+            )
+        return cursor.rowcount == 1
+
+    def release(self, shard, total, owner=None):
+        """Libera un lease sin completar (p. ej. tras una interrupción) para que otro nodo lo retome"""
+        owner = owner or default_owner()
+        with self._lock:
+            self.conn.execute(
+                "UPDATE shard_leases SET expires_at = 0 WHERE total = ? AND shard = ? AND owner = ? "
+                "AND finished_at IS NULL", (total, shard, owner)
+            )
+
+    def hold(self, shard, total, owner=None, on_lost=None):
+        """Context manager que renueva el lease cada ttl/3 segundos mientras dura el bloque
+
+        Si una renovación falla se llama on_lost() (desde el hilo que renueva)
+        y el keeper queda con lost=True.
+        """
+        return _LeaseKeeper(self, shard, total, owner or default_owner(), on_lost)
+
+    def status(self, total):
+        """{shard: {'owner', 'finished', 'records', 'expired'}} para los shards con lease"""
+        now = time.time()
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT shard, owner, expires_at, finished_at, records FROM shard_leases WHERE total = ?",
+                (total,)
+            ).fetchall()
+        return {
+            shard: {'owner': owner, 'finished': finished_at is not None, 'records': records,
+                    'expired': finished_at is None and (expires_at or 0) <= now}
+            for shard, owner, expires_at, finished_at, records in rows
+        }
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+class _LeaseKeeper:
+    def __init__(self, leases, shard, total, owner, on_lost=None):
+        self.leases = leases
+        self.shard = shard
+        self.total = total
+        self.owner = owner
+        self.on_lost = on_lost
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.leases.ttl / 3):
+            if not self.leases.renew(self.shard, self.total, self.owner):
+                logger.error(f"Se perdió el lease del shard {self.shard}/{self.total}: se corta el crawl")
+                self.lost = True
+                if self.on_lost:
+                    self.on_lost()
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def merge_partitions(paths, sinks):
+    """Vuelca la tabla `salarios` de cada partición SQLite en `sinks`; retorna los registros copiados"""
+    total = 0
+    for path in paths:
+        if not os.path.exists(path):
+            logger.warning(f"Falta la partición {path}")
+            continue
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.execute(f"SELECT {', '.join(COLUMNS)} FROM salarios")
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                sinks.write(dict(row) for row in rows)
+                total += len(rows)
+        finally:
+            conn.close()
+        logger.info(f"Partición {path} combinada")
+    return total
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Estado persistente del crawl por empresa (SQLite).
+- CrawlState: modo delta, solo se visitan empresas nuevas o cuyo <lastmod>
+  en el sitemap es posterior a la última vez que se extrajeron, y se guarda
+  un hash del contenido para no re-extraer páginas que no cambiaron.
+  También lleva el historial de cambios por empresa (intervalos entre
+  crawls y cuántos trajeron contenido nuevo) que usa crawl_scheduler.
+- CrawlFrontier: frontera + journal para retomar un crawl interrumpido.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+
+def parse_timestamp(value):
+    """Convierte un timestamp ISO 8601 (o fecha) a datetime UTC; None si no es válido"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def utc_now():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+class CrawlState:
+    def __init__(self, db_path='crawl_state.db'):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS companies (
+                slug TEXT PRIMARY KEY,
+                lastmod TEXT,
+                first_seen TEXT NOT NULL,
+                last_crawled TEXT,
+                removed_at TEXT,
+                content_hash TEXT,
+                content_changed_at TEXT,
+                crawl_intervals INTEGER NOT NULL DEFAULT 0,
+                interval_days REAL NOT NULL DEFAULT 0,
+                changes INTEGER NOT NULL DEFAULT 0
+            )
+            """)
+            # Bases creadas antes de guardar el hash del contenido y el historial de cambios
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(companies)")}
+            for column, definition in (('content_hash', 'TEXT'), ('content_changed_at', 'TEXT'),
+                                       ('crawl_intervals', 'INTEGER NOT NULL DEFAULT 0'),
+                                       ('interval_days', 'REAL NOT NULL DEFAULT 0'),
+                                       ('changes', 'INTEGER NOT NULL DEFAULT 0')):
+                if column not in columns:
+                    self.conn.execute(f"ALTER TABLE companies ADD COLUMN {column} {definition}")
+            self.conn.commit()
+
+    def plan_delta(self, entries):
+        """Registra las entradas (slug, lastmod) del sitemap y retorna (a_visitar, eliminadas)
+
+        a_visitar: slugs nuevos, sin crawl previo, sin lastmod o modificados
+        desde el último crawl. eliminadas: slugs que ya no están en el sitemap
+        (quedan marcados con removed_at).
+        """
+        now = utc_now()
+        to_crawl = []
+
+        with self._lock:
+            known = {
+                slug: last_crawled
+                for slug, last_crawled in self.conn.execute("SELECT slug, last_crawled FROM companies")
+            }
+
+            for slug, lastmod in entries:
+                self.conn.execute("""
+                INSERT INTO companies (slug, lastmod, first_seen) VALUES (?, ?, ?)
+                ON CONFLICT(slug) DO UPDATE SET lastmod = excluded.lastmod, removed_at = NULL
+                """, (slug, lastmod, now))
+
+                crawled = parse_timestamp(known.get(slug))
+                modified = parse_timestamp(lastmod)
+                if crawled is None or modified is None or modified > crawled:
+                    to_crawl.append(slug)
+
+            in_sitemap = {slug for slug, _ in entries}
+            removed = [
+                slug for (slug,) in self.conn.execute("SELECT slug FROM companies WHERE removed_at IS NULL")
+                if slug not in in_sitemap
+            ]
+            self.conn.executemany(
+                "UPDATE companies SET removed_at = ? WHERE slug = ?",
+                [(now, slug) for slug in removed]
+            )
+            self.conn.commit()
+
+        return to_crawl, removed
+
+    def mark_crawled(self, slug):
+        """Registra que la empresa se extrajo correctamente ahora
+
+        El tiempo desde el crawl anterior se suma al historial: si en este
+        crawl el contenido cambió, store_content_hash lo cuenta como cambio.
+        """
+        now = utc_now()
+        with self._lock:
+            row = self.conn.execute("SELECT last_crawled FROM companies WHERE slug = ?", (slug,)).fetchone()
+            previous = parse_timestamp(row[0]) if row else None
+            elapsed = (parse_timestamp(now) - previous).total_seconds() / 86400 if previous else None
+            self.conn.execute("""
+            INSERT INTO companies (slug, first_seen, last_crawled) VALUES (?, ?, ?)
+            ON CONFLICT(slug) DO UPDATE SET
+                last_crawled = excluded.last_crawled,
+                crawl_intervals = crawl_intervals + ?,
+                interval_days = interval_days + ?
+            """, (slug, now, now, 1 if elapsed is not None else 0, elapsed or 0.0))
+            self.conn.commit()
+
+    def content_hash(self, slug):
+        """Retorna el hash del contenido extraído la última vez (None si no hay)"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT content_hash FROM companies WHERE slug = ?", (slug,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def store_content_hash(self, slug, content_hash):
+        """Guarda el hash del contenido recién extraído de la empresa
+
+        Si ya había un hash distinto, cuenta un cambio en el historial.
+        """
+        with self._lock:
+            self.conn.execute("""
+            INSERT INTO companies (slug, first_seen, content_hash, content_changed_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(slug) DO UPDATE SET
+                changes = changes + (content_hash IS NOT NULL AND content_hash != excluded.content_hash),
+                content_hash = excluded.content_hash,
+                content_changed_at = excluded.content_changed_at
+            """, (slug, utc_now(), content_hash, utc_now()))
+            self.conn.commit()
+
+    def change_history(self):
+        """Retorna {slug: (last_crawled, intervalos, días_observados, cambios)} de las empresas vigentes"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT slug, last_crawled, crawl_intervals, interval_days, changes "
+                "FROM companies WHERE removed_at IS NULL"
+            ).fetchall()
+        return {slug: tuple(rest) for slug, *rest in rows}
+
+    def removed_companies(self):
+        """Retorna los slugs marcados como eliminados del sitemap"""
+        with self._lock:
+            return [slug for (slug,) in self.conn.execute(
+                "SELECT slug FROM companies WHERE removed_at IS NOT NULL ORDER BY slug"
+            )]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+class CrawlFrontier:
+    """Frontera de crawl persistente: estado por empresa + journal de registros extraídos
+
+    Cada empresa pasa por pending -> done | failed. Los registros de las
+    empresas completadas se agregan a un journal (append-only), de modo que
+    una ejecución interrumpida puede retomarse sin repetir lo ya extraído.
+    """
+
+    def __init__(self, db_path='crawl_frontier.db'):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS frontier (
+                slug TEXT PRIMARY KEY,
+                name TEXT,
+                position INTEGER NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                updated_at TEXT
+            )
+            """)
+            self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS journal (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                slug TEXT NOT NULL,
+                record TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """)
+            self.conn.commit()
+
+    def seed(self, companies, resume=False):
+        """Carga las empresas a visitar; sin resume descarta la ejecución anterior"""
+        with self._lock:
+            if not resume:
+                self.conn.execute("DELETE FROM frontier")
+                self.conn.execute("DELETE FROM journal")
+            offset = self.conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM frontier").fetchone()[0]
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO frontier (slug, name, position) VALUES (?, ?, ?)",
+                [(*_company_key(company), offset + i) for i, company in enumerate(companies)]
+            )
+            self.conn.commit()
+
+    def pending(self, companies=None):
+        """Retorna las empresas aún no completadas (pendientes o fallidas), en orden
+
+        Con `companies` solo las que están en esa lista (p. ej. la semilla del
+        run actual, para no retomar empresas de una ejecución anterior con
+        otra lista o otro límite).
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT slug, name FROM frontier WHERE status != 'done' ORDER BY position"
+            ).fetchall()
+        if companies is not None:
+            wanted = {_company_key(company)[0] for company in companies}
+            rows = [row for row in rows if row[0] in wanted]
+        return [(slug, name) if name is not None else slug for slug, name in rows]
+
+    def mark_done(self, slug, records):
+        """Agrega los registros al journal y marca la empresa como completada (atómico)"""
+        now = utc_now()
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO journal (slug, record, created_at) VALUES (?, ?, ?)",
+                [(slug, json.dumps(record, ensure_ascii=False), now) for record in records]
+            )
+            self.conn.execute(
+                "UPDATE frontier SET status = 'done', attempts = attempts + 1, last_error = NULL, "
+                "updated_at = ? WHERE slug = ?", (now, slug)
+            )
+
+    def mark_failed(self, slug, error):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE frontier SET status = 'failed', attempts = attempts + 1, last_error = ?, "
+                "updated_at = ? WHERE slug = ?", (str(error), utc_now(), slug)
+            )
+
+    def journal_records(self):
+        """Itera los registros ya extraídos, en orden de inserción"""
+        with self._lock:
+            rows = self.conn.execute("SELECT record FROM journal ORDER BY id").fetchall()
+        for (record,) in rows:
+            yield json.loads(record)
+
+    def summary(self):
+        """Retorna un dict {status: cantidad}"""
+        with self._lock:
+            return dict(self.conn.execute("SELECT status, COUNT(*) FROM frontier GROUP BY status"))
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def _company_key(company):
+    """(slug, nombre) o slug -> (slug, nombre|None)"""
+    if isinstance(company, tuple):
+        return company[0], company[1]
+    return company, None
@@ -200,16 +200,22 @@ def get_all_companies():
     """Retorna todas las empresas combinadas"""
     return EMPRESAS_COMPLETAS + EMPRESAS_TECH + EMPRESAS_INTERNACIONALES
 
+_registry = None
+
+
+def get_registry():
+    """Registro (con índices por slug, nombre y sector) de la lista manual, armado en el primer uso"""
+    global _registry
+    if _registry is None:
+        from company_registry import CompanyRegistry
+        tech = [(slug, name, 'tecnologia') for slug, name in EMPRESAS_TECH]
+        _registry = CompanyRegistry(companies=EMPRESAS_COMPLETAS + tech + EMPRESAS_INTERNACIONALES)
+    return _registry
+
+
 def get_companies_by_sector(sector):
     """Retorna empresas filtradas por sector"""
-    sectors = {
-        'bancos': [e for e in EMPRESAS_COMPLETAS if any(word in e[1].lower() for word in ['banco', 'financiera', 'credicorp'])],
-        'tecnologia': EMPRESAS_TECH,
-        'retail': [e for e in EMPRESAS_COMPLETAS if any(word in e[1].lower() for word in ['falabella', 'ripley', 'sodimac', 'hiraoka'])],
-        'telecomunicaciones': [e for e in EMPRESAS_COMPLETAS if any(word in e[1].lower() for word in ['entel', 'telefónica', 'claro'])],
-        'seguros': [e for e in EMPRESAS_COMPLETAS if 'seguro' in e[1].lower()],
-    }
-    return sectors.get(sector, [])
+    return get_registry().by_sector(sector)
 
 def print_companies_summary():
     """Imprime resumen de empresas disponibles"""
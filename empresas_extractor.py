@@ -4,20 +4,21 @@ Extractor automático de empresas desde SalariosPerú.com
 Obtiene la lista completa desde el dropdown "Escoge una empresa"
 """
 
-import requests
 from bs4 import BeautifulSoup
 import json
 import re
-from urllib.parse import unquote
 import time
 
+from company_health import DEAD, ERROR, NO_DATA, OK, CompanyHealth, verify_companies as verify_company_pages
+from company_registry import REGISTRY_PATH, write_registry
+from company_slugs import canonical_slug, company_url, has_special_chars
+from http_transport import HttpTransport
+
 class EmpresasExtractor:
     def __init__(self):
         self.base_url = "https://salariosperu.com"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.transport = HttpTransport(pool_size=4)
+        self.session = self.transport.session
         self.empresas = []
     
     def extract_companies_from_dropdown(self):
@@ -27,7 +28,7 @@ class EmpresasExtractor:
         
         try:
             # Obtener página principal
-            response = self.session.get(self.base_url, timeout=15)
+            response = self.transport.get(self.base_url)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -49,14 +50,14 @@ class EmpresasExtractor:
                         if value and text and value != 'default' and text != 'Escoge una empresa':
                             # Extraer slug de la URL
                             if '/empresa/' in value:
-                                slug = value.replace('/empresa/', '').strip('/')
+                                slug = canonical_slug(value.replace('/empresa/', ''))
                             else:
-                                slug = value
+                                slug = canonical_slug(value)
                             
                             empresas_encontradas.append({
                                 'slug': slug,
                                 'nombre': text,
-                                'url_completa': f"{self.base_url}/empresa/{slug}"
+                                'url_completa': company_url(slug, self.base_url)
                             })
             
             # Método 2: Buscar datalist
@@ -71,9 +72,9 @@ class EmpresasExtractor:
                         
                         if value and value != 'Escoge una empresa':
                             empresas_encontradas.append({
-                                'slug': value,
+                                'slug': canonical_slug(value),
                                 'nombre': text,
-                                'url_completa': f"{self.base_url}/empresa/{value}"
+                                'url_completa': company_url(value, self.base_url)
                             })
             
             # Método 3: Buscar en JavaScript (pueden estar en una variable JS)
@@ -106,15 +107,15 @@ class EmpresasExtractor:
                     texto = enlace.get_text(strip=True)
                     
                     if '/empresa/' in href:
-                        slug = href.replace('/empresa/', '').strip('/')
+                        slug = canonical_slug(href.split('/empresa/', 1)[1])
                         if slug and texto:
                             empresas_encontradas.append({
                                 'slug': slug,
                                 'nombre': texto,
-                                'url_completa': f"{self.base_url}{href}"
+                                'url_completa': company_url(slug, self.base_url)
                             })
             
-            # Eliminar duplicados y limpiar
+            # Eliminar duplicados (los slugs ya son canónicos: tildes y %XX dan el mismo) y limpiar
             empresas_unicas = {}
             for empresa in empresas_encontradas:
                 slug = empresa['slug']
@@ -144,7 +145,7 @@ class EmpresasExtractor:
         
         for api_url in api_urls:
             try:
-                response = self.session.get(api_url, timeout=10)
+                response = self.transport.get(api_url, timeout=10)
                 if response.status_code == 200:
                     try:
                         data = response.json()
@@ -159,49 +160,39 @@ class EmpresasExtractor:
         print("⚠️  No se encontró API específica")
         return []
     
-    def verify_companies(self, sample_size=5):
-        """Verifica que las empresas extraídas son válidas"""
-        print(f"\n🧪 Verificando muestra de {sample_size} empresas...")
-        
+    def verify_companies(self, sample_size=5, workers=8, method='range', health=None, max_rate=None):
+        """Verifica que las empresas extraídas son válidas
+
+        Con sample_size=None revisa la lista completa. Las peticiones van en
+        paralelo (`workers` hilos) y son livianas (ver company_health); con
+        `health` (CompanyHealth) el estado de cada slug queda guardado y las
+        empresas muertas se omiten en los próximos crawls. Van al ritmo cortés
+        de los scrapers salvo que `max_rate` permita subirlo.
+        """
         if not self.empresas:
             print("❌ No hay empresas para verificar")
             return False
         
-        sample = self.empresas[:sample_size]
-        valid_count = 0
+        sample = self.empresas if sample_size is None else self.empresas[:sample_size]
+        print(f"\n🧪 Verificando {len(sample)} empresas ({workers} hilos)...")
+        names = {canonical_slug(e['slug']): e['nombre'] for e in sample}
+        verbose = len(sample) <= 20
         
-        for i, empresa in enumerate(sample, 1):
-            print(f"  {i}. Verificando: {empresa['nombre']}")
-            
-            try:
-                response = self.session.get(empresa['url_completa'], timeout=10)
-                if response.status_code == 200:
-                    # Verificar que la página contiene información de salarios
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Buscar indicadores de que es una página válida
-                    has_salary_data = (
-                        soup.find('table') or 
-                        'salario' in response.text.lower() or
-                        'S/' in response.text or
-                        'puesto' in response.text.lower()
-                    )
-                    
-                    if has_salary_data:
-                        valid_count += 1
-                        print(f"    ✅ Válida")
-                    else:
-                        print(f"    ⚠️  Sin datos de salarios")
-                else:
-                    print(f"    ❌ Error HTTP {response.status_code}")
-                    
-            except Exception as e:
-                print(f"    ❌ Error: {e}")
-            
-            time.sleep(1)  # Pausa entre verificaciones
+        def report(slug, status, http_status):
+            # Con muchas empresas solo se listan las que fallan
+            if status == OK and not verbose:
+                return
+            detail = {OK: '✅ Válida', NO_DATA: '⚠️  Sin datos de salarios',
+                      DEAD: f'❌ No existe (HTTP {http_status})', ERROR: f'❌ Error (HTTP {http_status})'}[status]
+            print(f"  • {names.get(slug, slug)}: {detail}")
         
-        success_rate = (valid_count / sample_size) * 100
-        print(f"\n📊 Tasa de éxito: {success_rate:.1f}% ({valid_count}/{sample_size})")
+        results = verify_company_pages([e['slug'] for e in sample], health=health, workers=workers,
+                                       method=method, transport=self.transport, base_url=self.base_url,
+                                       on_result=report, max_rate=max_rate)
+        valid_count = sum(1 for status in results.values() if status == OK)
+        
+        success_rate = (valid_count / len(sample)) * 100
+        print(f"\n📊 Tasa de éxito: {success_rate:.1f}% ({valid_count}/{len(sample)})")
         
         return success_rate >= 60  # Al menos 60% de éxito
     
@@ -231,65 +222,19 @@ class EmpresasExtractor:
             print(f"❌ Error al guardar: {e}")
             return False
     
-    def generate_python_file(self, filename='empresas_auto.py'):
-        """Genera archivo Python con la lista de empresas"""
+    def generate_registry_file(self, filename=REGISTRY_PATH):
+        """Genera el registro de empresas (empresas.json) que leen los scrapers"""
         if not self.empresas:
-            print("❌ No hay empresas para generar archivo Python")
+            print("❌ No hay empresas para generar el registro")
             return False
         
-        # Filtrar empresas con tildes
-        empresas_con_tildes = [e for e in self.empresas if any(char in e['slug'] for char in 'áéíóúñ')]
-        
-        python_code = f'''#!/usr/bin/env python3
-"""
-Lista de empresas extraída automáticamente desde SalariosPerú.com
-Generado automáticamente el {time.strftime('%Y-%m-%d %H:%M:%S')}
-Total de empresas: {len(self.empresas)}
-Empresas con tildes: {len(empresas_con_tildes)}
-"""
-
-# Lista completa de empresas (slug, nombre)
-EMPRESAS_AUTO = [
-'''
-        
-        for empresa in self.empresas:
-            slug = empresa['slug'].replace("'", "\\'")
-            nombre = empresa['nombre'].replace("'", "\\'")
-            python_code += f"    ('{slug}', '{nombre}'),\n"
-        
-        python_code += ''']
-
-def get_empresas_auto():
-    """Retorna la lista completa de empresas"""
-    return EMPRESAS_AUTO
-
-def get_empresas_con_tildes():
-    """Retorna solo empresas con tildes"""
-    return [e for e in EMPRESAS_AUTO if any(char in e[0] for char in 'áéíóúñ')]
-
-def print_summary():
-    """Imprime resumen de empresas"""
-    print(f"Total de empresas: {len(EMPRESAS_AUTO)}")
-    empresas_tildes = get_empresas_con_tildes()
-    print(f"Empresas con tildes: {len(empresas_tildes)}")
-    
-    print("\\nEmpresas con caracteres especiales:")
-    for slug, nombre in empresas_tildes:
-        print(f"  • {nombre} ({slug})")
-
-if __name__ == "__main__":
-    print_summary()
-'''
-        
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(python_code)
-            
-            print(f"✅ Archivo Python generado: {filename}")
+            total = write_registry([(e['slug'], e['nombre']) for e in self.empresas], filename)
+            print(f"✅ Registro generado: {filename} ({total} empresas)")
             return True
             
         except Exception as e:
-            print(f"❌ Error al generar archivo Python: {e}")
+            print(f"❌ Error al generar el registro: {e}")
             return False
     
     def print_summary(self):
@@ -303,7 +248,7 @@ if __name__ == "__main__":
         print(f"Total de empresas: {len(self.empresas)}")
         
         # Contar empresas con tildes
-        empresas_tildes = [e for e in self.empresas if any(char in e['slug'] for char in 'áéíóúñ')]
+        empresas_tildes = [e for e in self.empresas if has_special_chars(e['slug'])]
         print(f"Empresas con tildes: {len(empresas_tildes)}")
         
         # Mostrar primeras 10
@@ -319,6 +264,26 @@ if __name__ == "__main__":
 
 def main():
     """Función principal"""
+    import sys
+
+    # --verify-all: verifica la lista completa y guarda el estado en company_health.db
+    verify_all = '--verify-all' in sys.argv
+    method = 'head' if '--head' in sys.argv else 'range'
+    workers = 16 if verify_all else 4
+    # --max-rate=N: permite subir el ritmo de verificación hasta N req/s (por defecto 1 cada 2 s)
+    max_rate = None
+    for arg in sys.argv:
+        if arg.startswith('--workers='):
+            try:
+                workers = int(arg.split('=', 1)[1])
+            except ValueError:
+                print("Formato invalido. Usa: --workers=16")
+        elif arg.startswith('--max-rate='):
+            try:
+                max_rate = float(arg.split('=', 1)[1])
+            except ValueError:
+                print("Formato invalido. Usa: --max-rate=4")
+
     print("🔍 EXTRACTOR AUTOMÁTICO DE EMPRESAS - SALARIOSPERU.COM")
     print("=" * 70)
     
@@ -335,23 +300,30 @@ def main():
         # Mostrar resumen
         extractor.print_summary()
         
-        # Verificar muestra
-        if extractor.verify_companies():
+        # Verificar muestra (o la lista completa)
+        if verify_all:
+            health = CompanyHealth()
+            valid = extractor.verify_companies(sample_size=None, workers=workers, method=method, health=health,
+                                               max_rate=max_rate)
+            print(f"📋 Estado guardado en {health.db_path}: {health.summary()}")
+        else:
+            valid = extractor.verify_companies(workers=workers, method=method, max_rate=max_rate)
+        if valid:
             print("\n✅ Verificación exitosa!")
             
             # Guardar archivos
             extractor.save_companies()
-            extractor.generate_python_file()
+            extractor.generate_registry_file()
             
             print("\n🎉 Extracción completada exitosamente!")
             print("\nArchivos generados:")
             print("  • empresas_extraidas.json - Datos completos en JSON")
-            print("  • empresas_auto.py - Lista para usar en Python")
+            print("  • empresas.json - Registro de empresas que usan los scrapers")
         else:
             print("\n⚠️  Algunas empresas pueden no ser válidas")
             print("Guardando datos de cualquier manera...")
             extractor.save_companies()
-            extractor.generate_python_file()
+            extractor.generate_registry_file()
     else:
         print("❌ No se pudieron extraer empresas")
 
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Cache persistente de validadores HTTP (ETag / Last-Modified) por URL.
+Guarda también los registros extraídos de cada página para poder
+reutilizarlos cuando el servidor responde 304 Not Modified.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+
+class HttpValidatorCache:
+    def __init__(self, db_path='http_cache.db'):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                records TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """)
+            self.conn.commit()
+
+    def conditional_headers(self, url):
+        """Retorna los headers If-None-Match / If-Modified-Since para la URL"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified FROM http_cache WHERE url = ?", (url,)
+            ).fetchone()
+        if not row:
+            return {}
+
+        headers = {}
+        etag, last_modified = row
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def cached_records(self, url):
+        """Retorna los registros guardados para la URL (None si no hay entrada)"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT records FROM http_cache WHERE url = ?", (url,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def store(self, url, response, records):
+        """Guarda validadores y registros de una respuesta 200"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO http_cache VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, json.dumps(records, ensure_ascii=False),
+                 datetime.now().isoformat())
+            )
+            self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
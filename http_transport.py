@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Transporte HTTP compartido por los scrapers de SalariosPerú.com
+Sesión requests con pool de conexiones dimensionado, keep-alive, compresión
+gzip (y brotli si está instalado), lectura de cuerpos en streaming y
+contabilidad de bytes y tiempos por petición (incluido el tiempo de conexión
+TCP/TLS, que solo se paga cuando el pool abre una conexión nueva).
+"""
+
+import io
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# urllib3 decodifica 'br' solo si hay una librería brotli instalada
+try:
+    import brotli  # noqa: F401
+    HAS_BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        HAS_BROTLI = True
+    except ImportError:
+        HAS_BROTLI = False
+
+ACCEPT_ENCODING = 'gzip, deflate, br' if HAS_BROTLI else 'gzip, deflate'
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'es-PE,es;q=0.9,en;q=0.8',
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Connection': 'keep-alive',
+}
+
+
+# Segundos de conexión de la petición en curso en este hilo (0 si se reusó una conexión)
+_connect_time = threading.local()
+
+
+class _TimedConnectionMixin:
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_time.seconds = getattr(_connect_time, 'seconds', 0.0) + time.perf_counter() - start
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    """HTTPAdapter cuyas conexiones miden su tiempo de conexión"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+
+class TransferStats:
+    """Totales de tráfico: bytes en la red, bytes descomprimidos y tiempos"""
+
+    def __init__(self):
+        self.requests = 0
+        self.wire_bytes = 0
+        self.body_bytes = 0
+        self.seconds = 0.0
+        self.first_byte_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, wire_bytes, body_bytes, seconds, first_byte_seconds):
+        with self._lock:
+            self.requests += 1
+            self.wire_bytes += wire_bytes
+            self.body_bytes += body_bytes
+            self.seconds += seconds
+            self.first_byte_seconds += first_byte_seconds
+
+    def summary(self):
+        with self._lock:
+            n = self.requests or 1
+            return {
+                'requests': self.requests,
+                'wire_mb': round(self.wire_bytes / 1024 / 1024, 3),
+                'body_mb': round(self.body_bytes / 1024 / 1024, 3),
+                'compression_ratio': round(self.body_bytes / self.wire_bytes, 2) if self.wire_bytes else None,
+                'avg_seconds': round(self.seconds / n, 4),
+                'avg_first_byte_seconds': round(self.first_byte_seconds / n, 4),
+            }
+
+
+class _BodyReader(io.RawIOBase):
+    """Archivo binario de solo lectura sobre un iterador de bloques de bytes"""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._pending = b''
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = chunk
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def close(self):
+        self._chunks.close()
+        super().close()
+
+
+class HttpTransport:
+    """Sesión HTTP afinada para crawling
+
+    Cada respuesta de get() trae además `wire_bytes` (bytes recibidos por la
+    red, comprimidos), `body_bytes` (bytes descomprimidos),
+    `connect_seconds` (conexión TCP/TLS; 0 si se reusó una del pool) y
+    `download_seconds` (tiempo total incluyendo la lectura del cuerpo).
+    Con `crawl_metrics` (CrawlMetrics) cada respuesta leída se registra ahí.
+    """
+
+    def __init__(self, pool_size=10, timeout=15, headers=None, chunk_size=16 * 1024, crawl_metrics=None):
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.stats = TransferStats()
+        self.crawl_metrics = crawl_metrics
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        if headers:
+            self.session.headers.update(headers)
+        self.resize_pool(pool_size)
+
+    def resize_pool(self, pool_size):
+        """Ajusta el pool para `pool_size` conexiones simultáneas por host"""
+        self.pool_size = pool_size
+        # Cerrar los adapters anteriores para no dejar sus conexiones abiertas
+        for old in set(self.session.adapters.values()):
+            old.close()
+        adapter = _TimedAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def open(self, url, headers=None, timeout=None):
+        """Inicia una petición sin leer el cuerpo (stream=True); cerrar la respuesta al terminar"""
+        _connect_time.seconds = 0.0
+        response = self.session.get(url, headers=headers, timeout=timeout or self.timeout, stream=True)
+        response.connect_seconds = _connect_time.seconds
+        return response
+
+    def head(self, url, headers=None, timeout=None):
+        """HEAD siguiendo redirecciones (solo estado y cabeceras, sin cuerpo)"""
+        _connect_time.seconds = 0.0
+        response = self.session.head(url, headers=headers, timeout=timeout or self.timeout, allow_redirects=True)
+        response.connect_seconds = _connect_time.seconds
+        return response
+
+    def iter_body(self, response):
+        """Itera el cuerpo descomprimido por bloques y registra el tráfico al terminar"""
+        start = time.perf_counter()
+        body_bytes = 0
+        try:
+            for chunk in response.iter_content(self.chunk_size):
+                body_bytes += len(chunk)
+                yield chunk
+        finally:
+            response.close()
+            first_byte = response.elapsed.total_seconds()
+            response.wire_bytes = response.raw.tell() if response.raw is not None else body_bytes
+            response.body_bytes = body_bytes
+            response.download_seconds = first_byte + time.perf_counter() - start
+            self.stats.record(response.wire_bytes, body_bytes, response.download_seconds, first_byte)
+            if self.crawl_metrics is not None:
+                self.crawl_metrics.observe_response(response)
+
+    def reader(self, response):
+        """Archivo binario sobre el cuerpo de una respuesta abierta con open(), leído en streaming"""
+        return io.BufferedReader(_BodyReader(self.iter_body(response)))
+
+    def get(self, url, headers=None, timeout=None, stop=None):
+        """GET: lee el cuerpo en streaming y lo deja en response.content
+
+        Con `stop`, se llama stop(bytes_leídos) tras cada bloque; si retorna True
+        se deja de leer, se cierra la conexión y response.truncated queda en True.
+        """
+        response = self.open(url, headers, timeout)
+        response.truncated = False
+        buffer = bytearray()
+        body = self.iter_body(response)
+        for chunk in body:
+            buffer += chunk
+            if stop is not None and stop(buffer):
+                response.truncated = True
+                body.close()
+                break
+        response._content = bytes(buffer)
+        return response
+
+    def metrics(self):
+        return {'pool_size': self.pool_size, **self.stats.summary()}
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Extractor rápido de bloques <script> en páginas de SalariosPerú.com
+Busca directamente en los bytes de la respuesta los bloques JSON-LD
+(application/ld+json) y los scripts self.__next_f.push (RSC de Next.js),
+sin construir el árbol DOM completo con BeautifulSoup.
+
+Uso como benchmark:
+  python jsonld_extractor.py                 # Página sintética
+  python jsonld_extractor.py pagina.html ... # Páginas guardadas
+"""
+
+import hashlib
+import json
+import re
+
+SCRIPT_RE = re.compile(rb'<script\b([^>]*)>(.*?)</script\s*>', re.S | re.I)
+LDJSON_TYPE_RE = re.compile(rb'''\btype\s*=\s*["']?application/ld\+json''', re.I)
+NEXTJS_MARKER = b'self.__next_f.push'
+HEAD_END_RE = re.compile(rb'</head\s*>', re.I)
+
+
+def _as_bytes(page):
+    """Acepta bytes, str o un BeautifulSoup ya construido"""
+    if isinstance(page, bytes):
+        return page
+    if isinstance(page, str):
+        return page.encode('utf-8')
+    return str(page).encode('utf-8')
+
+
+def iter_script_blocks(page):
+    """Itera (atributos, contenido) de cada <script> como bytes"""
+    for match in SCRIPT_RE.finditer(_as_bytes(page)):
+        yield match.group(1), match.group(2)
+
+
+def iter_jsonld(page):
+    """Itera los objetos JSON decodificados de cada bloque application/ld+json"""
+    for attrs, body in iter_script_blocks(page):
+        if not LDJSON_TYPE_RE.search(attrs):
+            continue
+        try:
+            yield json.loads(body.decode('utf-8', errors='replace'))
+        except json.JSONDecodeError:
+            continue
+
+
+def iter_nextjs_scripts(page):
+    """Itera el texto de los scripts que contienen el payload self.__next_f.push"""
+    for _, body in iter_script_blocks(page):
+        if NEXTJS_MARKER in body:
+            yield body.decode('utf-8', errors='replace')
+
+
+def extract_jsonld(page):
+    """Retorna (organization, job_postings) a partir de los bloques JSON-LD"""
+    organization = {}
+    job_postings = []
+
+    for data in iter_jsonld(page):
+        items = data if isinstance(data, list) else [data]
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            item_type = item.get('@type', '')
+            if item_type == 'Organization':
+                organization = item
+            elif item_type == 'JobPosting':
+                job_postings.append(item)
+
+    return organization, job_postings
+
+
+def payload_digest(page, nextjs=False):
+    """SHA-256 de los bloques JSON-LD (y RSC de Next.js con nextjs=True) de una página
+
+    Solo depende de los datos que se extraen: cambios en el resto del HTML
+    (scripts de analytics, ids de build, etc.) no alteran el hash.
+    """
+    digest = hashlib.sha256()
+    for attrs, body in iter_script_blocks(page):
+        if LDJSON_TYPE_RE.search(attrs) or (nextjs and NEXTJS_MARKER in body):
+            digest.update(body)
+            digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class JsonLdCutoff:
+    """Condición de corte para leer en streaming solo el <head> de una página de empresa
+
+    Se llama con el cuerpo leído hasta el momento y retorna True cuando ya
+    llegó el <head> completo con JobPosting: los bloques JSON-LD van ahí, así
+    que el resto del documento solo hace falta cuando no hay puestos (y
+    entran en juego los fallbacks RSC / tablas HTML). En ese caso se lee
+    todo. Cada llamada busca </head> solo en los bytes nuevos y el <head> se
+    parsea una sola vez; si el cuerpo vuelve a empezar (un reintento) el
+    estado se reinicia.
+    """
+
+    # Margen para encontrar un </head> partido entre dos bloques
+    OVERLAP = 64
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self._scanned = 0
+        self._decided = None
+
+    def __call__(self, partial):
+        if len(partial) < self._scanned:
+            self._reset()
+        if self._decided is not None:
+            return self._decided
+        end = HEAD_END_RE.search(partial, max(0, self._scanned - self.OVERLAP))
+        self._scanned = len(partial)
+        if not end:
+            return False
+        _, job_postings = extract_jsonld(bytes(partial[:end.start()]))
+        self._decided = bool(job_postings)
+        return self._decided
+
+
+def jsonld_complete(partial):
+    """True si el inicio de página `partial` ya trae el <head> completo con JobPosting
+
+    Para cortar una lectura en streaming usar una JsonLdCutoff por página.
+    """
+    return JsonLdCutoff()(partial)
+
+
+def synthetic_company_page(name='Empresa Demo', n_jobs=40, body_divs=3000):
+    """Página parecida a una de empresa: JSON-LD en el <head> y un <body> Next.js grande"""
+    organization = {'@context': 'https://schema.org', '@type': 'Organization', 'name': name}
+    jobs = [{
+        '@context': 'https://schema.org',
+        '@type': 'JobPosting',
+        'title': f'Analista {i}',
+        'description': f'Rango salarial: S/ {3000 + i * 50:,}.00 - S/ {5000 + i * 50:,}.00. Lima.',
+        'datePosted': '2026-01-15',
+    } for i in range(n_jobs)]
+    body = ''.join(
+        f'<div class="card"><span>Puesto {i}</span><a href="/empresa/demo?p={i}">ver</a></div>'
+        for i in range(body_divs)
+    )
+    rsc = ''.join(
+        f'<script>self.__next_f.push([1,"{{\\"title\\":\\"Puesto {i}\\",\\"salary_range\\":\\"S/ 4000\\"}}"])</script>'
+        for i in range(20)
+    )
+    return (
+        f'<!DOCTYPE html><html><head><title>Salarios en {name} - SalariosPeru</title>'
+        f'<script type="application/ld+json">{json.dumps(organization)}</script>'
+        f'<script type="application/ld+json">{json.dumps(jobs)}</script>'
+        f'</head><body>{body}{rsc}</body></html>'
+    ).encode('utf-8')
+
+
+def main():
+    """Compara el tiempo de parseo por página: BeautifulSoup vs extractor rápido"""
+    import sys
+    import time
+    from bs4 import BeautifulSoup
+
+    if len(sys.argv) > 1:
+        pages = [open(path, 'rb').read() for path in sys.argv[1:]]
+    else:
+        pages = [synthetic_company_page()]
+
+    def with_soup(content):
+        soup = BeautifulSoup(content, 'html.parser')
+        found = [json.loads(s.string) for s in soup.find_all('script', type='application/ld+json')]
+        found += [s.string for s in soup.find_all('script') if 'self.__next_f.push' in (s.string or '')]
+        return found
+
+    def fast(content):
+        return list(iter_jsonld(content)) + list(iter_nextjs_scripts(content))
+
+    rounds = 20
+    print(f"Benchmark de parseo: {len(pages)} pagina(s), {rounds} rondas")
+    print("=" * 60)
+    results = {}
+    for label, fn in (('BeautifulSoup', with_soup), ('Extractor rapido', fast)):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for content in pages:
+                fn(content)
+        per_page = (time.perf_counter() - start) / (rounds * len(pages)) * 1000
+        results[label] = per_page
+        print(f"  {label:<18} {per_page:>8.2f} ms/pagina")
+
+    print(f"\nAceleracion: {results['BeautifulSoup'] / results['Extractor rapido']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Archivo comprimido de páginas descargadas (direccionado por contenido).
+Cada página se guarda una sola vez como objects/ab/<sha256>.{zst,gz} y un
+índice SQLite registra (slug, url, fecha) -> sha256. Permite re-ejecutar la
+extracción sobre páginas ya descargadas (--reparse) sin acceso a la red.
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONS = {'zstd': '.zst', 'gzip': '.gz'}
+
+
+def compress(content, codec):
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=10).compress(content)
+    return gzip.compress(content, compresslevel=6)
+
+
+def load_object(path):
+    """Lee y descomprime un objeto del archivo según su extensión"""
+    data = Path(path).read_bytes()
+    if str(path).endswith('.zst'):
+        if zstandard is None:
+            raise RuntimeError("zstandard no instalado: no se puede leer " + str(path))
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class PageArchive:
+    def __init__(self, root='archivo_paginas', codec=None):
+        self.root = Path(root)
+        self.codec = codec or ('zstd' if zstandard is not None else 'gzip')
+        (self.root / 'objects').mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.root / 'index.db'), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                slug TEXT NOT NULL,
+                name TEXT,
+                url TEXT NOT NULL,
+                fetched_at TEXT NOT NULL,
+                sha256 TEXT NOT NULL,
+                object_path TEXT NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_slug ON pages(slug, fetched_at)")
+            self.conn.commit()
+
+    def put(self, slug, url, content, name=None):
+        """Archiva una página descargada y retorna su sha256"""
+        sha = hashlib.sha256(content).hexdigest()
+        relative = Path('objects') / sha[:2] / (sha + EXTENSIONS[self.codec])
+        path = self.root / relative
+
+        # Objetos inmutables: si el contenido ya existe (con cualquier codec) no se vuelve a escribir.
+        # Solo se miran las extensiones finales: un temporal de otro escritor no cuenta como objeto
+        existing = [path.parent / (sha + ext) for ext in EXTENSIONS.values()]
+        existing = [candidate for candidate in existing if candidate.exists()]
+        if existing:
+            relative = existing[0].relative_to(self.root)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Temporal con nombre único, fuera del espacio de nombres <sha>.<ext>
+            with tempfile.NamedTemporaryFile(dir=path.parent, prefix='.tmp-', delete=False) as tmp:
+                tmp.write(compress(content, self.codec))
+            os.replace(tmp.name, path)
+
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO pages (slug, name, url, fetched_at, sha256, object_path, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (slug, name, url, datetime.now().isoformat(), sha, str(relative), len(content))
+            )
+            self.conn.commit()
+        return sha
+
+    def get(self, sha):
+        """Retorna el contenido original de un objeto"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT object_path FROM pages WHERE sha256 = ? LIMIT 1", (sha,)
+            ).fetchone()
+        if not row:
+            raise KeyError(sha)
+        return load_object(self.root / row[0])
+
+    def latest(self):
+        """Retorna la última captura de cada slug: [(slug, name, url, fetched_at, ruta_objeto)]"""
+        with self._lock:
+            rows = self.conn.execute("""
+            SELECT slug, name, url, fetched_at, object_path FROM pages p
+            WHERE id = (SELECT MAX(id) FROM pages WHERE slug = p.slug)
+            ORDER BY slug
+            """).fetchall()
+        return [(slug, name, url, fetched_at, str(self.root / path))
+                for slug, name, url, fetched_at, path in rows]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def _reparse_worker(args):
+    parse_fn, slug, name, url, fetched_at, path = args
+    records = parse_fn(load_object(path), slug, name, url)
+    # La fecha de extracción es la de la descarga original, no la del re-parseo
+    for record in records:
+        record['fecha_extraccion'] = fetched_at
+    return records
+
+
+def reparse_archive(archive, parse_fn, workers=None):
+    """Re-ejecuta `parse_fn(content, slug, name, url)` sobre la última captura de cada empresa
+
+    Usa un ProcessPoolExecutor (un proceso por núcleo por defecto); itera las
+    listas de registros por empresa en el orden del índice. `parse_fn` debe ser
+    una función de módulo (serializable con pickle).
+    """
+    entries = archive.latest()
+    logger.info(f"Re-parseando {len(entries)} páginas archivadas en {archive.root}...")
+    tasks = [(parse_fn, *entry) for entry in entries]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_reparse_worker, tasks, chunksize=8)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Buffer columnar de registros de salarios
+Guarda los registros por columna en lugar de un dict por puesto: los textos
+se codifican con diccionario (cada valor distinto se guarda una sola vez,
+internado, y cada fila es un entero en un array) y los salarios van en
+arrays de float. Pasa a pandas con una sola copia compacta de cada array
+(Categorical.from_codes) y expone cada fila como SalaryRecord (__slots__).
+"""
+
+import math
+import sys
+from array import array
+
+from record_sinks import COLUMNS
+
+FLOAT_COLUMNS = ('salario_minimo', 'salario_maximo', 'salario_promedio')
+
+
+class SalaryRecord:
+    """Una fila del buffer; se lee como objeto (r.empresa) o como dict (r['empresa'], r.get())"""
+
+    __slots__ = tuple(COLUMNS)
+
+    def __init__(self, *values):
+        for column, value in zip(COLUMNS, values):
+            setattr(self, column, value)
+
+    def __getitem__(self, column):
+        if column not in COLUMNS:
+            raise KeyError(column)
+        return getattr(self, column)
+
+    def get(self, column, default=None):
+        return getattr(self, column, default) if column in COLUMNS else default
+
+    def keys(self):
+        return list(COLUMNS)
+
+    def to_dict(self):
+        return {column: getattr(self, column) for column in COLUMNS}
+
+    def __repr__(self):
+        return f"SalaryRecord({self.empresa!r}, {self.puesto!r}, {self.salario_promedio!r})"
+
+
+class _StringColumn:
+    """Columna de texto codificada con diccionario; el código -1 es None"""
+
+    def __init__(self):
+        self.values = []
+        self.index = {}
+        self.codes = array('i')
+
+    def append(self, value):
+        if value is None:
+            self.codes.append(-1)
+            return
+        value = str(value)
+        code = self.index.get(value)
+        if code is None:
+            code = len(self.values)
+            value = sys.intern(value)
+            self.values.append(value)
+            self.index[value] = code
+        self.codes.append(code)
+
+    def __getitem__(self, i):
+        code = self.codes[i]
+        return None if code < 0 else self.values[code]
+
+
+class _FloatColumn:
+    """Columna numérica en un array de doubles; NaN es None"""
+
+    def __init__(self):
+        self.data = array('d')
+
+    def append(self, value):
+        self.data.append(math.nan if value is None else float(value))
+
+    def __getitem__(self, i):
+        value = self.data[i]
+        return None if math.isnan(value) else value
+
+
+class RecordBuffer:
+    """Acumulador columnar de registros con la interfaz de lista que usan los scrapers
+
+    extend() recibe dicts (como los que produce parse_company_page); la
+    iteración y el índice retornan SalaryRecord. Las columnas fuera de
+    COLUMNS se descartan.
+    """
+
+    def __init__(self, records=None):
+        self._columns = {
+            column: _FloatColumn() if column in FLOAT_COLUMNS else _StringColumn()
+            for column in COLUMNS
+        }
+        self._length = 0
+        if records:
+            self.extend(records)
+
+    def append(self, record):
+        get = record.get
+        for column, store in self._columns.items():
+            store.append(get(column))
+        self._length += 1
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def __len__(self):
+        return self._length
+
+    def __bool__(self):
+        return self._length > 0
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._length))]
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError(i)
+        return SalaryRecord(*(self._columns[column][i] for column in COLUMNS))
+
+    def __iter__(self):
+        for i in range(self._length):
+            yield self[i]
+
+    def column(self, name):
+        """Itera los valores de una columna sin armar las filas"""
+        store = self._columns[name]
+        for i in range(self._length):
+            yield store[i]
+
+    def iter_dicts(self):
+        """Itera las filas como dicts (p. ej. para executemany con parámetros por nombre)"""
+        for record in self:
+            yield record.to_dict()
+
+    def iter_batches(self, size=1000):
+        """Itera las filas como listas de hasta `size` dicts (inserciones por lotes)"""
+        batch = []
+        for record in self.iter_dicts():
+            batch.append(record)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def clear(self):
+        self.__init__()
+
+    def to_dataframe(self):
+        """DataFrame con los textos como Categorical y los salarios como float64
+
+        Los arrays se copian: una vista (np.frombuffer) bloquearía el buffer y
+        cualquier append posterior fallaría con BufferError mientras exista
+        el DataFrame.
+        """
+        import numpy as np
+        import pandas as pd
+
+        data = {}
+        for column, store in self._columns.items():
+            if isinstance(store, _FloatColumn):
+                data[column] = np.array(store.data, dtype=np.float64)
+            else:
+                codes = np.array(store.codes, dtype=np.int32)
+                data[column] = pd.Categorical.from_codes(codes, categories=pd.Index(store.values, dtype=object))
+        return pd.DataFrame(data, columns=list(COLUMNS))
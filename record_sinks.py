@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Sinks de registros para los scrapers de SalariosPerú.com
+Escriben los registros en lotes a medida que se extraen (CSV, SQLite, MySQL),
+en lugar de acumular todo en memoria y guardarlo al final.
+"""
+
+import csv
+import logging
+import sqlite3
+from itertools import islice
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = [
+    'empresa', 'puesto', 'salario_minimo', 'salario_maximo', 'salario_promedio',
+    'moneda', 'universidad_principal', 'url_empresa', 'fecha_inicio', 'fecha_fin',
+    'fecha_extraccion',
+]
+
+
+class RecordSink:
+    """Base: acumula registros y los escribe cada `batch_size`"""
+
+    def __init__(self, batch_size=200):
+        self.batch_size = batch_size
+        self.written = 0
+        self._buffer = []
+
+    def write(self, records):
+        for record in records:
+            self._buffer.append(record)
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        self._write_batch(self._buffer)
+        self.written += len(self._buffer)
+        self._buffer = []
+
+    def close(self):
+        self.flush()
+        self._close()
+
+    def _write_batch(self, records):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvSink(RecordSink):
+    def __init__(self, filename, batch_size=200):
+        super().__init__(batch_size)
+        self.filename = filename
+        self._file = open(filename, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=COLUMNS, extrasaction='ignore')
+        self._writer.writeheader()
+
+    def _write_batch(self, records):
+        self._writer.writerows(records)
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+        logger.info(f"Datos guardados en {self.filename} ({self.written} registros)")
+
+
+class SqliteSink(RecordSink):
+    """Reemplaza la tabla `salarios` y la va llenando por lotes"""
+
+    def __init__(self, db_name, batch_size=200):
+        super().__init__(batch_size)
+        self.db_name = db_name
+        self.conn = sqlite3.connect(db_name)
+        self.conn.execute("DROP TABLE IF EXISTS salarios")
+        self.conn.execute("""
+        CREATE TABLE salarios (
+            empresa TEXT, puesto TEXT,
+            salario_minimo REAL, salario_maximo REAL, salario_promedio REAL,
+            moneda TEXT, universidad_principal TEXT, url_empresa TEXT,
+            fecha_inicio TEXT, fecha_fin TEXT, fecha_extraccion TEXT
+        )
+        """)
+        self.conn.commit()
+
+    def _write_batch(self, records):
+        placeholders = ', '.join(f':{c}' for c in COLUMNS)
+        self.conn.executemany(
+            f"INSERT INTO salarios ({', '.join(COLUMNS)}) VALUES ({placeholders})",
+            [{c: r.get(c) for c in COLUMNS} for r in records]
+        )
+        self.conn.commit()
+
+    def _close(self):
+        cursor = self.conn.cursor()
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_empresa ON salarios(empresa)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_puesto ON salarios(puesto)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_salario ON salarios(salario_promedio)")
+        self.conn.commit()
+        self.conn.close()
+        logger.info(f"Datos guardados en SQLite: {self.db_name} ({self.written} registros)")
+
+
+class MysqlSink(RecordSink):
+    """Vacía la tabla `salarios` de MySQL y la va llenando por lotes"""
+
+    def __init__(self, config, batch_size=200):
+        import mysql.connector
+
+        super().__init__(batch_size)
+        self.config = config
+        self.conn = mysql.connector.connect(**config)
+        cursor = self.conn.cursor()
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS salarios (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            empresa VARCHAR(255) NOT NULL,
+            puesto VARCHAR(500) NOT NULL,
+            salario_minimo DECIMAL(10,2),
+            salario_maximo DECIMAL(10,2),
+            salario_promedio DECIMAL(10,2),
+            moneda VARCHAR(10) DEFAULT 'PEN',
+            universidad_principal VARCHAR(255),
+            url_empresa VARCHAR(500),
+            fecha_inicio DATE,
+            fecha_fin DATE,
+            fecha_extraccion DATETIME DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_empresa (empresa),
+            INDEX idx_puesto (puesto),
+            INDEX idx_salario (salario_promedio)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+        """)
+        cursor.execute("DELETE FROM salarios")
+        self.conn.commit()
+        cursor.close()
+
+    def _write_batch(self, records):
+        cursor = self.conn.cursor()
+        cursor.executemany(f"""
+        INSERT INTO salarios ({', '.join(COLUMNS)})
+        VALUES ({', '.join(f'%({c})s' for c in COLUMNS)})
+        """, [{c: r.get(c) for c in COLUMNS} for r in records])
+        self.conn.commit()
+        cursor.close()
+
+    def _close(self):
+        self.conn.close()
+        logger.info(f"Datos guardados en MySQL: {self.config['database']} ({self.written} registros)")
+
+
+class SinkPipeline:
+    """Reparte cada lote de registros entre varios sinks"""
+
+    def __init__(self, sinks):
+        self.sinks = list(sinks)
+        self.count = 0
+
+    def write(self, records):
+        # Por tramos, para que un iterable grande (p.ej. el journal) no se cargue entero
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, 500))
+            if not chunk:
+                break
+            for sink in self.sinks:
+                sink.write(chunk)
+            self.count += len(chunk)
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
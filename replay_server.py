@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Servidor local que imita a SalariosPerú.com para pruebas y benchmarks.
+Sirve /sitemap.xml (o un índice de sitemaps .xml.gz) y /empresa/<slug> desde un archivo de páginas
+(page_archive) o con páginas sintéticas, con latencia, errores 5xx,
+respuestas 429 y compresión gzip configurables.
+
+Uso:
+  python replay_server.py --port=8765 --companies=300 --latency=0.2
+  python replay_server.py --archive=archivo_paginas --error-rate=0.05 --rate-429=0.02
+  python replay_server.py --companies=20000 --sitemap-size=5000   # Índice con hijos .xml.gz
+Luego apuntar los scrapers a http://127.0.0.1:8765 (atributo base_url).
+"""
+
+import gzip
+import http.server
+import random
+import threading
+import time
+from urllib.parse import quote, unquote
+
+from jsonld_extractor import synthetic_company_page
+from page_archive import load_object
+
+
+class ReplayServer:
+    def __init__(self, host='127.0.0.1', port=0, archive=None, companies=100, jobs_per_company=20,
+                 latency=0.0, jitter=0.0, error_rate=0.0, rate_429=0.0, retry_after=1, seed=None,
+                 compress=True, sitemap_size=None):
+        self.latency = latency
+        self.compress = compress
+        # Con sitemap_size, /sitemap.xml es un índice de sitemaps hijos .xml.gz de ese tamaño
+        self.sitemap_size = sitemap_size
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.jobs_per_company = jobs_per_company
+        self.random = random.Random(seed)
+        self.stats = {'requests': 0, 'bytes': 0, 'errors': 0, 'throttled': 0}
+        self._lock = threading.Lock()
+
+        # slug -> ruta del objeto en el archivo (None = página sintética)
+        if archive is not None:
+            self.pages = {slug: path for slug, _, _, _, path in archive.latest()}
+        else:
+            self.pages = {f'empresa-demo-{i:04d}': None for i in range(companies)}
+
+        handler = type('ReplayHandler', (_ReplayHandler,), {'replay': self})
+        self.httpd = http.server.ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def sitemap(self, part=None):
+        slugs = list(self.pages)
+        if self.sitemap_size and part is None:
+            children = ''.join(
+                f'<sitemap><loc>{self.base_url}/sitemap-empresas-{i}.xml.gz</loc></sitemap>'
+                for i in range((len(slugs) + self.sitemap_size - 1) // self.sitemap_size)
+            )
+            return ('<?xml version="1.0" encoding="UTF-8"?>'
+                    f'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{children}</sitemapindex>'
+                    ).encode('utf-8')
+        if part is not None:
+            slugs = slugs[part * self.sitemap_size:(part + 1) * self.sitemap_size]
+
+        urls = ''.join(
+            f'<url><loc>https://salariosperu.com/empresa/{quote(slug, safe="-.")}</loc>'
+            f'<lastmod>2026-01-01</lastmod></url>'
+            for slug in slugs
+        )
+        return ('<?xml version="1.0" encoding="UTF-8"?>'
+                f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>').encode('utf-8')
+
+    def company_page(self, slug):
+        if slug not in self.pages:
+            return None
+        path = self.pages[slug]
+        if path is not None:
+            return load_object(path)
+        name = slug.replace('-', ' ').title()
+        return synthetic_company_page(name, n_jobs=self.jobs_per_company, body_divs=500)
+
+    def count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def start(self):
+        """Arranca el servidor en un hilo en segundo plano"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class _ReplayHandler(http.server.BaseHTTPRequestHandler):
+    replay = None
+
+    def do_GET(self):
+        replay = self.replay
+        replay.count('requests')
+        delay = replay.latency + replay.random.uniform(0, replay.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        roll = replay.random.random()
+        if roll < replay.rate_429:
+            replay.count('throttled')
+            self.send_response(429)
+            self.send_header('Retry-After', str(replay.retry_after))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if roll < replay.rate_429 + replay.error_rate:
+            replay.count('errors')
+            self.send_error(503)
+            return
+
+        path = self.path.split('?', 1)[0]
+        if path == '/sitemap.xml':
+            body, content_type = replay.sitemap(), 'application/xml'
+        elif path.startswith('/sitemap-empresas-') and path.endswith('.xml.gz') and replay.sitemap_size:
+            part = path[len('/sitemap-empresas-'):-len('.xml.gz')]
+            body = gzip.compress(replay.sitemap(int(part))) if part.isdigit() else None
+            content_type = 'application/gzip'
+        elif path.startswith('/empresa/'):
+            body = replay.company_page(unquote(path[len('/empresa/'):]))
+            content_type = 'text/html; charset=utf-8'
+        else:
+            body = None
+
+        if body is None:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        if replay.compress and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body, compresslevel=6)
+            self.send_header('Content-Encoding', 'gzip')
+        replay.count('bytes', len(body))
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    import sys
+    from page_archive import PageArchive
+
+    options = {'port': 8765, 'companies': 100, 'latency': 0.0, 'error-rate': 0.0, 'rate-429': 0.0,
+               'sitemap-size': 0}
+    archive = None
+    for arg in sys.argv[1:]:
+        if arg.startswith('--archive='):
+            archive = PageArchive(arg.split('=', 1)[1])
+        elif arg.startswith('--') and '=' in arg:
+            key, value = arg[2:].split('=', 1)
+            if key in options:
+                options[key] = type(options[key])(value)
+
+    server = ReplayServer(port=options['port'], archive=archive, companies=options['companies'],
+                          latency=options['latency'], error_rate=options['error-rate'],
+                          rate_429=options['rate-429'], sitemap_size=options['sitemap-size'] or None)
+    print(f"Servidor de replay en {server.base_url} ({len(server.pages)} empresas)")
+    print("Ctrl+C para detener")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nEstadisticas: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
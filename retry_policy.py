@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Reintentos para los scrapers de SalariosPerú.com
+- RetryPolicy: backoff exponencial con jitter y presupuesto global de reintentos.
+- CircuitBreaker / HostCircuitBreakers: pausan las peticiones a un host
+  cuando la tasa de fallos se dispara, en vez de seguir golpeándolo.
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+import requests
+
+from throttling import retry_after_seconds
+
+logger = logging.getLogger(__name__)
+
+# Respuestas que indican un problema pasajero del servidor
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def is_transient(error):
+    """True si vale la pena reintentar la petición que lanzó `error`"""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    response = getattr(error, 'response', None)
+    return response is not None and response.status_code in RETRY_STATUSES
+
+
+class CircuitBreaker:
+    """Circuit breaker por tasa de fallos sobre las últimas `window` peticiones
+
+    Cerrado: las peticiones pasan. Si al menos `min_requests` de la ventana
+    se registraron y la fracción de fallos llega a `failure_threshold`, se abre
+    y wait() bloquea durante `cooldown` segundos. Luego deja pasar una sola
+    petición de prueba: si funciona se cierra, si falla se vuelve a abrir.
+    """
+
+    def __init__(self, name='', failure_threshold=0.6, window=30, min_requests=10, cooldown=30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.min_requests = min_requests
+        self.cooldown = cooldown
+        self.state = 'cerrado'
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._outcomes = deque(maxlen=window)
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Bloquea mientras el circuito esté abierto; retorna los segundos esperados"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self.state == 'abierto' and now >= self.opened_at + self.cooldown:
+                    self.state = 'semiabierto'
+                    self._probing = False
+                if self.state == 'cerrado':
+                    return waited
+                if self.state == 'semiabierto' and not self._probing:
+                    self._probing = True
+                    return waited
+                pause = max(0.1, self.opened_at + self.cooldown - now) if self.state == 'abierto' else 0.2
+            time.sleep(pause)
+            waited += pause
+
+    def release(self):
+        """Libera la petición de prueba del estado semiabierto sin registrar un resultado"""
+        with self._lock:
+            self._probing = False
+
+    def record(self, success):
+        """Registra el resultado de una petición"""
+        with self._lock:
+            if self.state == 'semiabierto':
+                self._probing = False
+                if success:
+                    self.state = 'cerrado'
+                    self._outcomes.clear()
+                    logger.info(f"Circuito {self.name} cerrado: el host responde de nuevo")
+                else:
+                    self._open()
+                return
+
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if (self.state == 'cerrado' and len(self._outcomes) >= self.min_requests
+                    and failures / len(self._outcomes) >= self.failure_threshold):
+                self._open()
+
+    def _open(self):
+        self.state = 'abierto'
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        logger.warning(f"Circuito {self.name} abierto: demasiados fallos, pausa de {self.cooldown:.0f}s")
+
+
+class HostCircuitBreakers:
+    """Mantiene un CircuitBreaker independiente por host"""
+
+    def __init__(self, **options):
+        self.options = options
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, url):
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(host, **self.options)
+                self._breakers[host] = breaker
+            return breaker
+
+
+class RetryPolicy:
+    """Backoff exponencial con jitter completo, presupuesto y circuit breaker
+
+    Cada reintento espera un valor aleatorio entre 0 y
+    min(max_delay, base_delay * 2**intento) (o el Retry-After, si es mayor;
+    un Retry-After de más de `max_retry_after` segundos se recorta).
+    El presupuesto limita los reintentos a `budget_ratio` por petición más
+    `min_budget`, para que una caída no multiplique la carga sobre el sitio.
+    """
+
+    def __init__(self, max_attempts=4, base_delay=1.0, max_delay=30.0, budget_ratio=0.2,
+                 min_budget=10, breakers=None, seed=None, max_retry_after=120.0):
+        self.max_attempts = max_attempts
+        self.max_retry_after = max_retry_after
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self.min_budget = min_budget
+        self.breakers = breakers if breakers is not None else HostCircuitBreakers()
+        self.stats = {'requests': 0, 'retries': 0, 'failures': 0, 'budget_exhausted': 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def backoff(self, attempt, retry_after=None):
+        """Segundos a esperar antes del reintento número `attempt` (desde 1)"""
+        with self._lock:
+            delay = self._random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        return max(delay, min(retry_after or 0.0, self.max_retry_after))
+
+    def _spend_retry(self):
+        with self._lock:
+            if self.stats['retries'] >= self.min_budget + self.budget_ratio * self.stats['requests']:
+                self.stats['budget_exhausted'] += 1
+                return False
+            self.stats['retries'] += 1
+            return True
+
+    def call(self, url, send, stop=None):
+        """Ejecuta `send()` (una petición a `url`) reintentando los fallos pasajeros
+
+        Relanza la última excepción si se agotan los intentos o el presupuesto,
+        o de inmediato si el error no es pasajero (p. ej. un 404). Con `stop`
+        (threading.Event) la espera entre intentos se interrumpe al activarlo
+        y se relanza el error sin reintentar.
+        """
+        breaker = self.breakers.breaker(url) if self.breakers else None
+        with self._lock:
+            self.stats['requests'] += 1
+
+        attempt = 0
+        while True:
+            attempt += 1
+            if breaker:
+                breaker.wait()
+            error = None
+            success = None
+            try:
+                response = send()
+                success = True
+            except requests.RequestException as e:
+                error = e
+                success = not is_transient(e)
+            finally:
+                if breaker:
+                    if success is None:
+                        # send() lanzó otra excepción: no dejar tomada la petición de prueba
+                        breaker.release()
+                    else:
+                        breaker.record(success)
+
+            if error is not None:
+                transient = is_transient(error)
+                if not transient or attempt >= self.max_attempts or not self._spend_retry():
+                    with self._lock:
+                        self.stats['failures'] += 1
+                    raise error
+                response = getattr(error, 'response', None)
+                retry_after = retry_after_seconds(response.headers.get('Retry-After')) if response is not None else None
+                delay = self.backoff(attempt, retry_after)
+                logger.info(f"Reintento {attempt}/{self.max_attempts - 1} de {url} en {delay:.1f}s ({error.__class__.__name__})")
+                if stop is None:
+                    time.sleep(delay)
+                elif stop.wait(delay):
+                    raise error
+                continue
+
+            return response
+
+    def metrics(self):
+        with self._lock:
+            return dict(self.stats)
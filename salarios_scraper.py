@@ -3,110 +3,306 @@
 Web Scraper para SalariosPerú.com (2026)
 Descubre empresas desde el sitemap y extrae datos de salarios via JSON-LD.
 Almacena en SQLite, CSV o MySQL.
+
+Con --delta solo se visitan las empresas nuevas o modificadas y los archivos
+salarios_peru_delta.csv/.db contienen únicamente lo extraído en ese run: se
+sobrescriben en cada --delta y no se combinan con salarios_peru.csv/.db.
 """
 
 import requests
 from bs4 import BeautifulSoup
-import pandas as pd
 import sqlite3
+import asyncio
 import time
-import re
-import json
 import logging
 from datetime import datetime
-from urllib.parse import urljoin, quote, unquote
+from urllib.parse import urljoin
+
+from company_health import exclude_dead
+from company_registry import get_registry
+from company_slugs import SlugCache, canonical_slug, company_url, slug_to_name
+from crawl_metrics import CrawlMetrics
+from crawl_pipeline import iter_in_thread, run_pipeline
+from crawl_scheduler import ChangeRateScheduler
+from crawl_state import CrawlState
+from http_cache import HttpValidatorCache
+from http_transport import HttpTransport
+from jsonld_extractor import JsonLdCutoff, iter_jsonld, payload_digest
+from page_archive import PageArchive, reparse_archive
+from record_buffer import RecordBuffer
+from record_sinks import CsvSink, SinkPipeline, SqliteSink
+from retry_policy import RetryPolicy
+from salary_parsing import extract_salary_text, parse_salary
+from sitemap_reader import iter_sitemap
+from throttling import AdaptiveThrottle, HostRateLimiter
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
 class SalariosPeruScraper:
-    def __init__(self, delay=2):
+    def __init__(self, delay=2, http_cache=None, crawl_state=None, sinks=None, archive=None,
+                 throttle=None, retry_policy=None, transport=None, early_stop=False, metrics=None,
+                 slug_cache=None, skip_unchanged=False):
         self.base_url = "https://salariosperu.com"
         self.delay = delay
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-        })
-        self.companies = []
-        self.salary_data = []
+        # Con throttle (AdaptiveThrottle) el ritmo se adapta al sitio y reemplaza a delay
+        self.throttle = throttle
+        # Con retry_policy (RetryPolicy) los fallos pasajeros se reintentan con backoff
+        self.retry_policy = retry_policy
+        self.failed_companies = []
+        # Empresas descargadas cuyo JSON-LD no cambió desde el último crawl (requiere crawl_state)
+        self.unchanged_count = 0
+        # Con skip_unchanged (modo delta) esas empresas no se re-extraen ni se escriben; si no,
+        # el hash solo alimenta el historial de cambios (--schedule) y la empresa se extrae igual
+        self.skip_unchanged = skip_unchanged
+        # Empresas extraídas cuyo estado (último crawl y hash) se confirma recién cuando sus
+        # registros se guardan: id(registros) -> [(slug, hash, registros)] (ver _commit_crawled)
+        self._uncommitted = {}
+        self.http_cache = http_cache
+        self.crawl_state = crawl_state
+        self.archive = archive
+        # Con slug_cache (SlugCache) se usan y se guardan los nombres reales de las empresas
+        self.slug_cache = slug_cache
+        # Con sinks los registros se escriben a medida que se extraen y no se acumulan
+        self.sinks = sinks
+        self.records_count = 0
+        # Mientras corre iter_company_records: entrega de registros al consumidor y aviso de corte
+        self._outbox = None
+        self._stop = None
+        # Tiempos por etapa y contadores del run (ver crawl_metrics)
+        self.metrics = metrics or CrawlMetrics()
+        self.transport = transport or HttpTransport(crawl_metrics=self.metrics)
+        if self.transport.crawl_metrics is None:
+            self.transport.crawl_metrics = self.metrics
+        # Método de extracción del último parseo ('jsonld' o None si no hubo registros)
+        self.extraction_method = None
+        # Con early_stop las páginas de empresa se dejan de leer apenas llega el JSON-LD
+        self.early_stop = early_stop
+        self.session = self.transport.session
+        # None hasta que discover_companies corre; una lista vacía (delta sin cambios) no se redescubre
+        self.companies = None
+        # Registros en memoria (sin sinks), por columnas
+        self.salary_data = RecordBuffer()
 
     def get_page(self, url):
         """Obtiene el contenido HTML de una página"""
+        self._pause()
+        return self._fetch_soup(url)
+
+    def _pause(self):
+        if not self.throttle:
+            if self._stop is not None:
+                # Espera interrumpible: al cortar iter_company_records (o Ctrl+C) no se agota el delay
+                self._stop.wait(self.delay)
+            else:
+                time.sleep(self.delay)
+            self.metrics.observe('queue_wait', self.delay)
+
+    def _stopped(self):
+        """True si el consumidor de iter_company_records dejó de iterar"""
+        return self._stop is not None and self._stop.is_set()
+
+    def _fetch_soup(self, url):
+        """Descarga una página sin pausas (el ritmo lo controla quien llama)"""
+        response = self._fetch(url)
+        if response is None:
+            return None
+        return BeautifulSoup(response.content, 'html.parser')
+
+    def _fetch(self, url, headers=None, stop=None):
+        """Descarga una URL y retorna la respuesta (None si hubo error)"""
+        if self._stopped():
+            # El consumidor de iter_company_records dejó de iterar: no más peticiones
+            return None
         try:
-            time.sleep(self.delay)
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
+            if self.retry_policy:
+                return self.retry_policy.call(url, lambda: self._get(url, headers, stop), self._stop)
+            return self._get(url, headers, stop)
         except requests.RequestException as e:
             logger.error(f"Error al obtener {url}: {e}")
             return None
 
-    def discover_companies(self):
-        """Descubre empresas desde el sitemap.xml"""
-        logger.info("Descubriendo empresas desde sitemap.xml...")
-
+    def _get(self, url, headers=None, stop=None):
+        """Un solo intento de descarga; lanza RequestException si falla"""
+        if self.throttle:
+            self.metrics.observe('queue_wait', self.throttle.wait())
+        response = None
         try:
-            response = self.session.get(f"{self.base_url}/sitemap.xml", timeout=15)
+            response = self.transport.get(url, headers=headers, stop=stop)
             response.raise_for_status()
+            return response
+        finally:
+            if self.throttle:
+                self.throttle.observe(response)
+
+    def discover_companies(self, delta=False):
+        """Descubre empresas desde el sitemap.xml
+
+        Con delta=True (requiere crawl_state) solo deja en self.companies las
+        empresas nuevas o con <lastmod> posterior a su último crawl, y marca
+        como eliminadas las que desaparecieron del sitemap.
+        """
+        logger.info("Descubriendo empresas desde sitemap.xml...")
+        all_companies = None
+        self.companies = []
 
-            slugs = re.findall(
-                r'<loc>https?://(?:www\.)?salariosperu\.com/empresa/([^<]+)</loc>',
-                response.text
-            )
-            slugs = [s.strip() for s in slugs if s.strip() and s.strip() != 'None']
-
-            self.companies = []
-            for slug in slugs:
-                name = unquote(slug).replace('-', ' ').title()
-                self.companies.append((slug, name))
+        try:
+            # Lectura en streaming; sigue índices de sitemaps y .xml.gz
+            # Los slugs ya vienen canónicos: una empresa repetida con otra codificación se visita una vez
+            entries = []
+            seen = set()
+            known_names = self.slug_cache.names() if self.slug_cache else {}
+            companies = []
+            for slug, lastmod in iter_sitemap(f"{self.base_url}/sitemap.xml", self.transport):
+                if slug in seen:
+                    continue
+                seen.add(slug)
+                entries.append((slug, lastmod))
+                companies.append((slug, known_names.get(slug) or slug_to_name(slug)))
+            # Lo que lista el sitemap se visita aunque company_health.db la diera por muerta
+            self.companies = companies
 
             logger.info(f"Encontradas {len(self.companies)} empresas en el sitemap")
 
+            if delta and self.crawl_state:
+                all_companies = self.companies
+                to_crawl, removed = self.crawl_state.plan_delta(entries)
+                pending = set(to_crawl)
+                self.companies = [c for c in all_companies if c[0] in pending]
+                logger.info(f"Modo delta: {len(self.companies)} nuevas/modificadas, "
+                            f"{len(removed)} eliminadas del sitemap")
+
         except Exception as e:
             logger.error(f"Error al obtener sitemap: {e}")
-            # Fallback: cargar desde empresas_auto.py
-            try:
-                from empresas_auto import get_empresas_auto
-                self.companies = get_empresas_auto()
-                logger.info(f"Cargadas {len(self.companies)} empresas desde empresas_auto.py")
-            except ImportError:
+            # Fallback: cargar desde el registro de empresas (empresas.json)
+            registry = get_registry()
+            if registry.available():
+                self.companies = exclude_dead(registry.all())
+                logger.info(f"Cargadas {len(self.companies)} empresas desde {registry.path}")
+            else:
                 logger.error("No se pudo obtener lista de empresas")
 
         # Guardar lista
         with open('empresas_encontradas.txt', 'w', encoding='utf-8') as f:
-            for slug, name in self.companies:
+            for slug, name in all_companies or self.companies:
                 f.write(f"{slug}\t{name}\n")
 
         return self.companies
 
-    def extract_company_data(self, company_info):
-        """Extrae datos de salarios de una empresa usando JSON-LD"""
+    def _company_target(self, company_info):
+        """Retorna (slug, nombre, url) para una empresa o slug"""
         if isinstance(company_info, tuple):
-            slug, display_name = company_info
+            slug, display_name = canonical_slug(company_info[0]), company_info[1]
         else:
-            slug = company_info
-            display_name = unquote(slug).replace('-', ' ').title()
+            slug = canonical_slug(company_info)
+            display_name = (self.slug_cache and self.slug_cache.name(slug)) or slug_to_name(slug)
+        return slug, display_name, company_url(slug, self.base_url)
 
-        encoded_slug = quote(slug, safe='-.')
-        company_url = f"{self.base_url}/empresa/{encoded_slug}"
+    def extract_company_data(self, company_info):
+        """Extrae datos de salarios de una empresa usando JSON-LD (None si no se pudo descargar)"""
+        slug, display_name, company_url = self._company_target(company_info)
 
         logger.info(f"Extrayendo datos de: {display_name}")
-        soup = self.get_page(company_url)
-        if not soup:
-            return []
+        self._pause()
+        return self._scrape_company_url(slug, display_name, company_url)
+
+    def _scrape_company_url(self, slug, display_name, company_url):
+        """Descarga y extrae una empresa; con cache HTTP reutiliza los registros si responde 304
 
+        Retorna None si la página no se pudo descargar (la empresa se reintenta al final).
+        """
+        download = self._download_company(slug, display_name, company_url)
+        if download is None:
+            return None
+        response, content_hash, company_data = download
+        if company_data is None:
+            company_data = self._parse_timed(response.content, display_name, company_url)
+            self._store_extracted(slug, company_url, response, company_data)
+        self._track_crawled(company_data, slug, content_hash)
+        return company_data
+
+    def _download_company(self, slug, display_name, company_url):
+        """Descarga una empresa sin extraerla
+
+        Retorna None si falló, o (response, content_hash, registros) donde
+        registros ya viene resuelto (no hace falta parsear) si el servidor
+        respondió 304 o (con skip_unchanged) el JSON-LD no cambió desde el último crawl.
+        """
+        headers = self.http_cache.conditional_headers(company_url) if self.http_cache else None
+        # El archivo de páginas necesita el documento completo
+        stop = JsonLdCutoff() if self.early_stop and not self.archive else None
+        response = self._fetch(company_url, headers, stop)
+        if response is None:
+            self.metrics.inc('failures_total', reason='descarga')
+            return None
+
+        if response.status_code == 304:
+            cached = self.http_cache.cached_records(company_url)
+            if cached is not None:
+                logger.info(f"Sin cambios (304), reutilizando {len(cached)} puestos de {display_name}")
+                self.metrics.inc('cache_hits_total', kind='304')
+                return None, None, cached
+            response = self._fetch(company_url, stop=stop)
+            if response is None:
+                self.metrics.inc('failures_total', reason='descarga')
+                return None
+
+        if self.archive:
+            self.archive.put(slug, company_url, response.content, name=display_name)
+
+        # Con crawl_state y skip_unchanged, si el JSON-LD es idéntico al del último crawl no se re-extrae
+        content_hash = None
+        if self.crawl_state:
+            content_hash = payload_digest(response.content)
+            if self.skip_unchanged and content_hash == self.crawl_state.content_hash(slug):
+                logger.info(f"Contenido sin cambios, se omite {display_name}")
+                self.unchanged_count += 1
+                self.metrics.inc('cache_hits_total', kind='contenido')
+                return None, None, []
+
+        return response, content_hash, None
+
+    def _store_extracted(self, slug, company_url, response, company_data):
+        """Persiste validadores HTTP y nombre real tras extraer una página"""
+        if self.slug_cache and company_data:
+            self.slug_cache.put(slug, company_data[0]['empresa'], base_url=self.base_url)
+        if self.http_cache:
+            self.http_cache.store(company_url, response, company_data)
+
+    def _track_crawled(self, records, slug, content_hash=None):
+        """Deja pendiente el estado de una empresa extraída hasta que se guarden sus registros"""
+        if self.crawl_state:
+            self._uncommitted.setdefault(id(records), []).append((slug, content_hash, records))
+
+    def _commit_crawled(self, records):
+        """Marca como extraídas las empresas de `records` (ya guardados o consumidos)
+
+        Si el run se corta antes (Ctrl+C, error, consumidor que deja de
+        iterar), la empresa no queda marcada y el próximo --delta la vuelve a
+        visitar.
+        """
+        for slug, content_hash, _ in self._uncommitted.pop(id(records), ()):
+            self.crawl_state.mark_crawled(slug)
+            if content_hash:
+                self.crawl_state.store_content_hash(slug, content_hash)
+
+    def _parse_timed(self, page, display_name, company_url):
+        """parse_company_page registrando el tiempo y el método de extracción"""
+        start = time.perf_counter()
+        company_data = self.parse_company_page(page, display_name, company_url)
+        self.metrics.record_parse(self.extraction_method, company_data, time.perf_counter() - start)
+        return company_data
+
+    def parse_company_page(self, page, display_name, company_url):
+        """Extrae los puestos (JSON-LD) de una página ya descargada (bytes, str o soup)"""
         company_data = []
         real_name = display_name
+        # Una marca de tiempo por página: todas las filas comparten el mismo string (ver RecordBuffer)
+        extracted_at = datetime.now().isoformat()
 
-        # Extraer de JSON-LD
-        for script in soup.find_all('script', type='application/ld+json'):
-            try:
-                data = json.loads(script.string)
-            except (json.JSONDecodeError, TypeError):
-                continue
-
+        # Extraer de JSON-LD directamente de los bytes, sin construir el DOM
+        for data in iter_jsonld(page):
             items = data if isinstance(data, list) else [data]
             for item in items:
                 if not isinstance(item, dict):
@@ -133,68 +329,210 @@ class SalariosPeruScraper:
                             'url_empresa': company_url,
                             'fecha_inicio': item.get('datePosted', ''),
                             'fecha_fin': item.get('validThrough', ''),
-                            'fecha_extraccion': datetime.now().isoformat()
+                            'fecha_extraccion': extracted_at
                         })
 
+        self.extraction_method = 'jsonld' if company_data else None
         logger.info(f"Extraidos {len(company_data)} puestos de {real_name}")
         return company_data
 
     def _extract_salary_text(self, description):
         """Extrae texto de salario de la descripción"""
-        if not description:
-            return None
-        match = re.search(r'Rango salarial:\s*(S/[^.]+)', description)
-        if match:
-            return match.group(1).strip()
-        match = re.search(r'S/\s*[\d,]+\.?\d*(?:\s*-\s*S/\s*[\d,]+\.?\d*)?', description)
-        if match:
-            return match.group(0).strip()
-        return None
+        return extract_salary_text(description)
 
     def parse_salary(self, salary_text):
         """Parsea texto de salario"""
-        if not salary_text:
-            return None, None, None
-
-        clean = salary_text.replace('S/', '').replace('PEN', '').replace(',', '').strip()
-
-        range_match = re.search(r'(\d+\.?\d*)\s*-\s*(\d+\.?\d*)', clean)
-        if range_match:
-            s_min = float(range_match.group(1))
-            s_max = float(range_match.group(2))
-            return s_min, s_max, (s_min + s_max) / 2
+        return parse_salary(salary_text)
 
-        single_match = re.search(r'(\d+\.?\d*)', clean)
-        if single_match:
-            val = float(single_match.group(1))
-            return val, val, val
+    def scrape_all_companies(self, max_companies=None, concurrency=1, rate=2.0, parse_workers=0):
+        """Extrae datos de todas las empresas (ver iter_company_records)
 
-        return None, None, None
-
-    def scrape_all_companies(self, max_companies=None):
-        """Extrae datos de todas las empresas"""
-        if not self.companies:
+        Los registros van a los sinks o se acumulan en self.salary_data; se
+        retorna al terminar el RecordBuffer (vacío con sinks).
+        """
+        if self.companies is None:
             self.discover_companies()
 
         companies = self.companies[:max_companies] if max_companies else self.companies
         logger.info(f"Iniciando scraping de {len(companies)} empresas...")
 
+        for records in self.iter_company_records(companies, concurrency, rate, parse_workers):
+            self._store(records)
+
+        logger.info(f"Scraping completado. Total: {self.records_count} registros")
+        return self.salary_data
+
+    def iter_company_records(self, companies, concurrency=1, rate=2.0, parse_workers=0, max_pending=None):
+        """Genera la lista de registros de cada empresa a medida que se extrae
+
+        Con concurrency > 1 usa el motor asyncio: varias peticiones en vuelo
+        y un token bucket por host (`rate` peticiones/segundo) en lugar del
+        delay fijo entre peticiones.
+
+        Con parse_workers > 0 las páginas se parsean en un pool de procesos
+        alimentado por las descargas concurrentes (ver crawl_pipeline).
+
+        El crawl corre en un hilo y se frena si hay `max_pending` empresas sin
+        consumir; si se deja de iterar, no se hacen más peticiones. Las
+        empresas cuya descarga falló se reintentan una vez al final del
+        recorrido; las que vuelven a fallar quedan en self.failed_companies.
+        """
+        def produce(emit, stop):
+            self._outbox, self._stop = emit, stop
+            try:
+                self._crawl_with_retry(companies, concurrency, rate, parse_workers)
+            finally:
+                self._outbox = self._stop = None
+
+        records_iter = iter_in_thread(produce, max_pending or max(2, 2 * concurrency))
+        try:
+            for records in records_iter:
+                yield records
+                # El consumidor volvió por más: ya procesó estos registros
+                self._commit_crawled(records)
+        finally:
+            records_iter.close()
+
+    def _crawl_with_retry(self, companies, concurrency, rate, parse_workers):
+        """Recorre las empresas, reintenta una vez las fallidas y resume las métricas (en el hilo del crawl)"""
+        failed = self._crawl(companies, concurrency, rate, parse_workers)
+        if failed and not self._stop.is_set():
+            logger.warning(f"Reintentando al final {len(failed)} empresas con descarga fallida")
+            failed = self._crawl(failed, concurrency, rate, parse_workers)
+        self.failed_companies = failed
+        if failed:
+            logger.error(f"Sin descargar tras reintentos: {len(failed)} empresas")
+
+        if self.crawl_state:
+            logger.info(f"Empresas sin cambios en el contenido: {self.unchanged_count}")
+        if self.throttle:
+            logger.info(f"Ritmo adaptativo: {self.throttle.metrics()}")
+            self.metrics.absorb('throttle', self.throttle.metrics())
+        if self.retry_policy:
+            logger.info(f"Reintentos: {self.retry_policy.metrics()}")
+            self.metrics.absorb('retry', self.retry_policy.metrics())
+        logger.info(f"Tráfico HTTP: {self.transport.metrics()}")
+        self.metrics.absorb('transport', self.transport.metrics())
+
+    def _crawl(self, companies, concurrency, rate, parse_workers=0):
+        """Recorre las empresas y retorna las que no se pudieron descargar"""
+        if parse_workers:
+            return self._crawl_pipelined(companies, concurrency, rate, parse_workers)
+        if concurrency > 1:
+            return asyncio.run(self._scrape_concurrently(companies, concurrency, rate))
+
+        failed = []
         for i, company in enumerate(companies, 1):
+            if self._stopped():
+                break
             data = self.extract_company_data(company)
-            self.salary_data.extend(data)
+            if data is None and self._stopped():
+                # Cortada por el consumidor: no es un fallo de descarga
+                break
+            if data is None:
+                failed.append(company)
+            else:
+                self._emit(data)
 
             if i % 10 == 0:
-                logger.info(f"Progreso: {i}/{len(companies)} | Registros: {len(self.salary_data)}")
+                logger.info(f"Progreso: {i}/{len(companies)} | Registros: {self.records_count}")
+        return failed
 
-        logger.info(f"Scraping completado. Total: {len(self.salary_data)} registros")
-        return self.salary_data
+    def _emit(self, records):
+        """Entrega los registros de una empresa al consumidor de iter_company_records o los guarda"""
+        if self._outbox is not None:
+            self._outbox(records)
+        else:
+            self._store(records)
+
+    def _store(self, records):
+        """Escribe los registros en los sinks o los acumula en memoria"""
+        if self.sinks:
+            self.sinks.write(records)
+        else:
+            self.salary_data.extend(records)
+        self.records_count += len(records)
+        self._commit_crawled(records)
+
+    async def _scrape_concurrently(self, companies, concurrency, rate):
+        """Motor asyncio: hasta `concurrency` descargas simultáneas, limitadas por host"""
+        limiter = HostRateLimiter(rate)
+        semaphore = asyncio.Semaphore(concurrency)
+        if self.transport.pool_size < concurrency:
+            self.transport.resize_pool(concurrency)
+        total = len(companies)
+        done = 0
+        failed = []
+
+        async def worker(company):
+            nonlocal done
+            slug, display_name, company_url = self._company_target(company)
+            queued_at = time.perf_counter()
+            async with semaphore:
+                await limiter.acquire_async(company_url)
+                self.metrics.observe('queue_wait', time.perf_counter() - queued_at)
+                logger.info(f"Extrayendo datos de: {display_name}")
+                data = await asyncio.to_thread(self._scrape_company_url, slug, display_name, company_url)
+
+            if data is None:
+                failed.append(company)
+            else:
+                self._emit(data)
+
+            done += 1
+            if done % 10 == 0:
+                logger.info(f"Progreso: {done}/{total} | Registros: {self.records_count}")
+
+        await asyncio.gather(*(worker(company) for company in companies))
+        return failed
+
+    def _crawl_pipelined(self, companies, concurrency, rate, parse_workers):
+        """Descargas concurrentes en hilos + parseo en `parse_workers` procesos"""
+        limiter = HostRateLimiter(rate)
+        if self.transport.pool_size < concurrency:
+            self.transport.resize_pool(concurrency)
+        total = len(companies)
+        done = 0
+
+        def fetch(company):
+            slug, display_name, company_url = self._company_target(company)
+            self.metrics.observe('queue_wait', limiter.acquire(company_url))
+            logger.info(f"Extrayendo datos de: {display_name}")
+            download = self._download_company(slug, display_name, company_url)
+            if download is None:
+                return None
+            response, content_hash, company_data = download
+            if company_data is not None:
+                return company_data
+            return (response.content, slug, display_name, company_url), (response, content_hash)
+
+        def deliver(company, parsed, context):
+            nonlocal done
+            slug, _, company_url = self._company_target(company)
+            if context is None:
+                company_data = parsed
+                self._track_crawled(company_data, slug)
+            else:
+                company_data, method, seconds = parsed
+                self.metrics.record_parse(method, company_data, seconds)
+                response, content_hash = context
+                self._store_extracted(slug, company_url, response, company_data)
+                self._track_crawled(company_data, slug, content_hash)
+            self._emit(company_data)
+
+            done += 1
+            if done % 10 == 0:
+                logger.info(f"Progreso: {done}/{total} | Registros: {self.records_count}")
+
+        return run_pipeline(companies, fetch, reparse_page_timed, deliver,
+                            concurrency=concurrency, parse_workers=parse_workers)
 
     def save_to_csv(self, filename='salarios_peru.csv'):
         """Guarda los datos en CSV"""
         if not self.salary_data:
             logger.warning("No hay datos para guardar")
             return
-        df = pd.DataFrame(self.salary_data)
+        df = self.salary_data.to_dataframe()
         df.to_csv(filename, index=False, encoding='utf-8')
         logger.info(f"Datos guardados en {filename}")
 
@@ -204,7 +542,7 @@ class SalariosPeruScraper:
             logger.warning("No hay datos para guardar")
             return
         conn = sqlite3.connect(db_name)
-        df = pd.DataFrame(self.salary_data)
+        df = self.salary_data.to_dataframe()
         df.to_sql('salarios', conn, if_exists='replace', index=False)
         cursor = conn.cursor()
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_empresa ON salarios(empresa)")
@@ -244,7 +582,8 @@ class SalariosPeruScraper:
                 %(salario_promedio)s, %(moneda)s, %(universidad_principal)s,
                 %(url_empresa)s, %(fecha_inicio)s, %(fecha_fin)s, %(fecha_extraccion)s)
             """
-            cursor.executemany(insert_q, self.salary_data)
+            for batch in self.salary_data.iter_batches():
+                cursor.executemany(insert_q, batch)
             conn.commit()
             cursor.close()
             conn.close()
@@ -258,7 +597,7 @@ class SalariosPeruScraper:
         """Genera un reporte de análisis"""
         if not self.salary_data:
             return
-        df = pd.DataFrame(self.salary_data)
+        df = self.salary_data.to_dataframe()
         df_valid = df[df['salario_promedio'].notna() & (df['salario_promedio'] > 0)]
 
         print("\n" + "=" * 60)
@@ -285,41 +624,154 @@ class SalariosPeruScraper:
                 print(f"  S/ {r['mean']:>10,.2f} ({int(r['count']):>3} puestos) | {emp[:40]}")
 
 
+_reparse_scraper = None
+
+
+def reparse_page(content, slug, name, url):
+    """Extracción sin red para --reparse y --parse-workers (se ejecuta en los procesos del pool)"""
+    global _reparse_scraper
+    if _reparse_scraper is None:
+        _reparse_scraper = SalariosPeruScraper(delay=0)
+    display_name = name or slug_to_name(slug)
+    return _reparse_scraper.parse_company_page(content, display_name, url)
+
+
+def reparse_page_timed(content, slug, name, url):
+    """reparse_page para el pipeline: retorna (registros, método, segundos) para las métricas"""
+    start = time.perf_counter()
+    records = reparse_page(content, slug, name, url)
+    return records, _reparse_scraper.extraction_method, time.perf_counter() - start
+
+
 def main():
     import sys
 
     print("Salarios Peru - Web Scraper 2026")
     print("=" * 50)
 
-    scraper = SalariosPeruScraper(delay=2)
-
     max_companies = None
+    http_cache = None
+    delta = '--delta' in sys.argv
+    schedule = '--schedule' in sys.argv
+    budget = None
+    time_budget = None
+    stream = '--stream' in sys.argv
+    archive = None
+    reparse_dir = None
+    workers = None
+    parse_workers = 0
+    concurrency = 1
+    rate = 2.0
+    adaptive = '--adaptive' in sys.argv
+    early_stop = '--early-stop' in sys.argv
+    metrics_path = None
     for arg in sys.argv:
         if arg.startswith('--limit='):
             try:
                 max_companies = int(arg.split('=')[1])
             except ValueError:
                 pass
+        elif arg.startswith('--concurrency='):
+            try:
+                concurrency = int(arg.split('=')[1])
+            except ValueError:
+                pass
+        elif arg.startswith('--rate='):
+            try:
+                rate = float(arg.split('=')[1])
+            except ValueError:
+                pass
+        elif arg == '--http-cache' or arg.startswith('--http-cache='):
+            http_cache = HttpValidatorCache(arg.split('=', 1)[1] if '=' in arg else 'http_cache.db')
+        elif arg == '--archive' or arg.startswith('--archive='):
+            archive = PageArchive(arg.split('=', 1)[1] if '=' in arg else 'archivo_paginas')
+        elif arg == '--reparse' or arg.startswith('--reparse='):
+            reparse_dir = arg.split('=', 1)[1] if '=' in arg else 'archivo_paginas'
+        elif arg.startswith('--workers='):
+            try:
+                workers = int(arg.split('=')[1])
+            except ValueError:
+                pass
+        elif arg.startswith('--parse-workers='):
+            try:
+                parse_workers = int(arg.split('=')[1])
+            except ValueError:
+                pass
+        elif arg.startswith('--budget='):
+            try:
+                budget = int(arg.split('=')[1])
+            except ValueError:
+                pass
+        elif arg.startswith('--time-budget='):
+            try:
+                time_budget = float(arg.split('=')[1])
+            except ValueError:
+                pass
+        elif arg == '--metrics' or arg.startswith('--metrics='):
+            metrics_path = arg.split('=', 1)[1] if '=' in arg else 'metricas_crawl'
+
+    if reparse_dir:
+        # Re-extracción desde el archivo de páginas: sin red, en paralelo por núcleo
+        scraper = SalariosPeruScraper(delay=0)
+        for records in reparse_archive(PageArchive(reparse_dir), reparse_page, workers=workers):
+            scraper._emit(records)
+        print(f"Re-extraidos {scraper.records_count} registros")
+        scraper.save_to_csv('salarios_peru_reparse.csv')
+        scraper.save_to_sqlite('salarios_peru_reparse.db')
+        return
+
+    # --schedule también usa el estado: de ahí sale el historial de cambios
+    crawl_state = CrawlState() if delta or schedule else None
+    # --adaptive: ritmo AIMD en lugar de la pausa fija de 2s (--rate pasa a ser el tope)
+    throttle = AdaptiveThrottle(max_rate=rate) if adaptive else None
+    scraper = SalariosPeruScraper(delay=2, http_cache=http_cache, crawl_state=crawl_state,
+                                  archive=archive, throttle=throttle, retry_policy=RetryPolicy(),
+                                  early_stop=early_stop, slug_cache=SlugCache(),
+                                  skip_unchanged=delta)
+    # En modo delta los archivos solo contienen las empresas nuevas o modificadas
+    suffix = '_delta' if delta else ''
+    if stream:
+        scraper.sinks = SinkPipeline([
+            CsvSink(f'salarios_peru{suffix}.csv'),
+            SqliteSink(f'salarios_peru{suffix}.db'),
+        ])
 
     try:
-        companies = scraper.discover_companies()
+        companies = scraper.discover_companies(delta=delta)
         print(f"Encontradas {len(companies)} empresas")
 
-        data = scraper.scrape_all_companies(max_companies=max_companies)
-        print(f"Extraidos {len(data)} registros")
-
-        scraper.save_to_csv('salarios_peru.csv')
-        scraper.save_to_sqlite('salarios_peru.db')
-        scraper.generate_analysis_report()
+        if schedule:
+            # Primero las empresas que más probablemente cambiaron; --budget / --time-budget recortan
+            seconds_per_request = 1 / rate if concurrency > 1 or adaptive else scraper.delay
+            scraper.companies = ChangeRateScheduler(crawl_state).plan(
+                companies, max_requests=budget, time_budget=time_budget,
+                seconds_per_request=seconds_per_request)
+            print(f"Planificadas {len(scraper.companies)} visitas por frecuencia de cambio")
+
+        scraper.scrape_all_companies(max_companies=max_companies,
+                                     concurrency=concurrency, rate=rate,
+                                     parse_workers=parse_workers)
+        print(f"Extraidos {scraper.records_count} registros")
+
+        if stream:
+            scraper.sinks.close()
+        else:
+            scraper.save_to_csv(f'salarios_peru{suffix}.csv')
+            scraper.save_to_sqlite(f'salarios_peru{suffix}.db')
+            scraper.generate_analysis_report()
 
         print("\nArchivos generados:")
-        print("- salarios_peru.csv")
-        print("- salarios_peru.db")
+        print(f"- salarios_peru{suffix}.csv")
+        print(f"- salarios_peru{suffix}.db")
+        if delta:
+            print("  (solo las empresas nuevas o modificadas de este run; se sobrescriben en cada --delta)")
         print("- empresas_encontradas.txt")
 
     except KeyboardInterrupt:
         print("\nInterrumpido. Guardando datos parciales...")
-        if scraper.salary_data:
+        if stream:
+            scraper.sinks.close()
+        elif scraper.salary_data:
             scraper.save_to_csv('salarios_peru_parcial.csv')
             scraper.save_to_sqlite('salarios_peru_parcial.db')
     except Exception as e:
@@ -327,6 +779,11 @@ def main():
         import traceback
         traceback.print_exc()
 
+    if metrics_path:
+        # También tras una interrupción: las métricas parciales sirven para ver dónde se fue el tiempo
+        prom, summary = scraper.metrics.export(metrics_path)
+        print(f"Métricas: {prom} / {summary}")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Parseo de salarios de SalariosPerú.com
+Versión escalar (un texto a la vez, usada por los scrapers) y versión
+vectorizada sobre pandas (str.extract) para re-procesar cientos de miles de
+descripciones en segundos. Ambas producen exactamente los mismos valores.
+
+Uso como verificación/benchmark:
+  python salary_parsing.py                         # Descripciones sintéticas
+  python salary_parsing.py datos.csv descripcion   # Columna de un CSV
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# Patrones precompilados (los mismos que usaban los scrapers)
+SALARY_LABEL_RE = re.compile(r'Rango salarial:\s*(S/[^.]+)')
+SALARY_AMOUNT_RE = re.compile(r'S/\s*[\d,]+\.?\d*(?:\s*-\s*S/\s*[\d,]+\.?\d*)?')
+RANGE_RE = re.compile(r'(\d+\.?\d*)\s*-\s*(\d+\.?\d*)')
+SINGLE_RE = re.compile(r'(\d+\.?\d*)')
+
+_SALARY_AMOUNT_GROUP_RE = re.compile(f'({SALARY_AMOUNT_RE.pattern})')
+
+
+def extract_salary_text(description):
+    """Extrae el texto de salario ('S/ 3,600.00 - S/ 5,000.00') de una descripción"""
+    if not description:
+        return None
+    match = SALARY_LABEL_RE.search(description)
+    if match:
+        return match.group(1).strip()
+    match = SALARY_AMOUNT_RE.search(description)
+    if match:
+        return match.group(0).strip()
+    return None
+
+
+def parse_salary(salary_text):
+    """Parsea un texto de salario y retorna (min, max, promedio)"""
+    if not salary_text:
+        return None, None, None
+
+    clean = salary_text.replace('S/', '').replace('PEN', '').replace(',', '').strip()
+
+    # Rango: "3600.00 - 5000.00"
+    range_match = RANGE_RE.search(clean)
+    if range_match:
+        salary_min = float(range_match.group(1))
+        salary_max = float(range_match.group(2))
+        return salary_min, salary_max, (salary_min + salary_max) / 2
+
+    # Valor único: "4600.00"
+    single_match = SINGLE_RE.search(clean)
+    if single_match:
+        val = float(single_match.group(1))
+        return val, val, val
+
+    return None, None, None
+
+
+def _as_series(values):
+    if isinstance(values, pd.Series):
+        return values.astype(object)
+    return pd.Series(list(values), dtype=object)
+
+
+def extract_salary_texts(descriptions):
+    """Versión vectorizada de extract_salary_text: Series de textos (NaN si no hay salario)"""
+    descriptions = _as_series(descriptions)
+    texts = descriptions.str.extract(SALARY_LABEL_RE, expand=False).str.strip()
+
+    # El patrón genérico solo se evalúa donde no hubo "Rango salarial:"
+    missing = texts.isna() & descriptions.map(lambda d: isinstance(d, str) and bool(d))
+    if missing.any():
+        plain = descriptions[missing].str.extract(_SALARY_AMOUNT_GROUP_RE, expand=False).str.strip()
+        texts = texts.astype(object)
+        texts[missing] = plain
+    return texts
+
+
+def parse_salaries(salary_texts):
+    """Versión vectorizada de parse_salary
+
+    Retorna un DataFrame con columnas salario_minimo, salario_maximo y
+    salario_promedio (float64, NaN donde no hay salario), con el mismo índice.
+    Los textos repetidos (muy comunes) se parsean una sola vez.
+    """
+    texts = _as_series(salary_texts)
+    codes, uniques = pd.factorize(texts)
+    uniques = pd.Series(uniques, dtype=object)
+
+    clean = (uniques.str.replace('S/', '', regex=False)
+                    .str.replace('PEN', '', regex=False)
+                    .str.replace(',', '', regex=False)
+                    .str.strip())
+
+    ranges = clean.str.extract(RANGE_RE)
+    has_range = ranges[0].notna()
+    single = pd.Series(float('nan'), index=clean.index)
+    if (~has_range).any():
+        single[~has_range] = clean[~has_range].str.extract(SINGLE_RE, expand=False).astype(float)
+
+    salary_min = ranges[0].astype(float).where(has_range, single)
+    salary_max = ranges[1].astype(float).where(has_range, single)
+    salary_avg = ((salary_min + salary_max) / 2).where(has_range, single)
+
+    # Volver a expandir a una fila por texto (código -1 = sin texto)
+    valid = codes >= 0
+    take = codes.clip(min=0)
+    columns = {}
+    for name, values in (('salario_minimo', salary_min), ('salario_maximo', salary_max),
+                         ('salario_promedio', salary_avg)):
+        array = values.to_numpy(dtype=float)[take] if len(values) else np.full(len(codes), np.nan)
+        array[~valid] = np.nan
+        columns[name] = array
+    return pd.DataFrame(columns, index=texts.index)
+
+
+def parse_descriptions(descriptions):
+    """Descripciones de JobPosting -> DataFrame salario_minimo/maximo/promedio"""
+    return parse_salaries(extract_salary_texts(descriptions))
+
+
+def main():
+    """Verifica que la versión vectorizada coincide con la escalar y compara tiempos"""
+    import math
+    import sys
+    import time
+
+    if len(sys.argv) > 2:
+        descriptions = pd.read_csv(sys.argv[1], usecols=[sys.argv[2]])[sys.argv[2]]
+    else:
+        samples = [
+            'Rango salarial: S/ {a:,}.00 - S/ {b:,}.00. Lima, Perú.',
+            'Sueldo S/ {a:,} mensual',
+            'Ofrecemos S/{a:,}.50 - S/{b:,}.50 y beneficios',
+            'Salario a convenir',
+            '',
+        ]
+        descriptions = pd.Series([
+            samples[i % len(samples)].format(a=1000 + i % 9000, b=2000 + i % 9000)
+            for i in range(200_000)
+        ])
+
+    start = time.perf_counter()
+    scalar = [parse_salary(extract_salary_text(d if isinstance(d, str) else None)) for d in descriptions]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = parse_descriptions(descriptions)
+    batch_time = time.perf_counter() - start
+
+    def same(a, b):
+        return (a is None and math.isnan(b)) or a == b
+
+    mismatches = sum(
+        not all(same(a, b) for a, b in zip(row, values))
+        for row, values in zip(scalar, batch.itertuples(index=False))
+    )
+
+    print(f"Descripciones: {len(descriptions):,}")
+    print(f"  Escalar:     {scalar_time:>7.2f} s")
+    print(f"  Vectorizado: {batch_time:>7.2f} s")
+    print(f"Diferencias: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
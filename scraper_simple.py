@@ -5,48 +5,82 @@ Extrae datos de salarios desde JSON-LD (Schema.org JobPosting)
 Compatible con el nuevo sitio Next.js
 """
 
-import requests
 from bs4 import BeautifulSoup
-import pandas as pd
 import sqlite3
 import json
 import time
 import re
 import logging
+from contextlib import nullcontext
 from datetime import datetime
-from urllib.parse import quote, unquote
+
+from company_health import exclude_dead
+from company_registry import get_registry
+from company_slugs import SlugCache, canonical_slug, company_url, dedupe_companies, slug_to_name
+from crawl_metrics import CrawlMetrics
+from crawl_pipeline import iter_in_thread, run_pipeline
+from crawl_sharding import ShardLeases, filter_shard, merge_partitions, parse_shard
+from crawl_state import CrawlFrontier
+from http_cache import HttpValidatorCache
+from http_transport import HttpTransport
+from jsonld_extractor import JsonLdCutoff, extract_jsonld, iter_nextjs_scripts
+from page_archive import PageArchive, reparse_archive
+from record_buffer import RecordBuffer
+from record_sinks import CsvSink, MysqlSink, SinkPipeline, SqliteSink
+from retry_policy import RetryPolicy
+from salary_parsing import extract_salary_text, parse_salary
+from throttling import AdaptiveThrottle
 
 # Configuración de logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-try:
-    from empresas_auto import get_empresas_auto
-    EMPRESAS_SOURCE = "auto"
-except ImportError:
-    from empresas_completas import get_all_companies
-    EMPRESAS_SOURCE = "manual"
-
-
 class SalariosScraperSimple:
-    def __init__(self, delay=2, use_mysql=False):
+    def __init__(self, delay=2, use_mysql=False, http_cache=None, frontier=None, sinks=None,
+                 archive=None, throttle=None, retry_policy=None, transport=None,
+                 early_stop=False, metrics=None, slug_cache=None):
         self.base_url = "https://salariosperu.com"
         self.delay = delay
+        # Con throttle (AdaptiveThrottle) el ritmo se adapta al sitio y reemplaza a delay
+        self.throttle = throttle
+        # Con retry_policy (RetryPolicy) los fallos pasajeros se reintentan con backoff
+        self.retry_policy = retry_policy
         self.use_mysql = use_mysql
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'es-PE,es;q=0.9,en;q=0.8',
-        })
-        self.salary_data = []
-
-        # Cargar empresas
-        if EMPRESAS_SOURCE == "auto":
-            self.all_companies = get_empresas_auto()
+        self.http_cache = http_cache
+        self.frontier = frontier
+        self.archive = archive
+        # Con slug_cache (SlugCache) se usan y se guardan los nombres reales de las empresas
+        self.slug_cache = slug_cache
+        # Con sinks los registros se escriben a medida que se extraen y no se acumulan
+        self.sinks = sinks
+        self.records_count = 0
+        # Resultado de la última ejecución: {'ok': empresas con datos, 'fail': sin datos o fallidas}
+        self.counts = {'ok': 0, 'fail': 0}
+        # Mientras corre iter_company_records: entrega de registros al consumidor y aviso de corte
+        self._outbox = None
+        self._stop = None
+        self._cancelled = False
+        # Tiempos por etapa y contadores del run (ver crawl_metrics)
+        self.metrics = metrics or CrawlMetrics()
+        self.transport = transport or HttpTransport(crawl_metrics=self.metrics)
+        if self.transport.crawl_metrics is None:
+            self.transport.crawl_metrics = self.metrics
+        # Método que dio los registros en el último parseo: 'jsonld', 'nextjs', 'html' o None
+        self.extraction_method = None
+        # Con early_stop las páginas de empresa se dejan de leer apenas llega el JSON-LD
+        self.early_stop = early_stop
+        self.session = self.transport.session
+        # Registros en memoria (sin sinks), por columnas
+        self.salary_data = RecordBuffer()
+
+        # Cargar empresas (slugs canónicos, sin duplicados por codificación ni empresas muertas)
+        registry = get_registry()
+        if registry.available():
+            self.all_companies = exclude_dead(registry.all())
             logger.info(f"Usando lista automática: {len(self.all_companies)} empresas")
         else:
-            self.all_companies = get_all_companies()
+            from empresas_completas import get_all_companies
+            self.all_companies = exclude_dead(dedupe_companies(get_all_companies()))
             logger.info(f"Usando lista manual: {len(self.all_companies)} empresas")
 
         # Empresas para testing rápido
@@ -70,52 +104,73 @@ class SalariosScraperSimple:
 
     def get_page(self, url):
         """Obtiene el contenido HTML de una página"""
+        response = self.fetch_page(url)
+        if response is None:
+            return None
+        return BeautifulSoup(response.content, 'html.parser')
+
+    def fetch_page(self, url, headers=None, stop=None):
+        """Descarga una URL y retorna la respuesta (None si hubo error)
+
+        `stop` es una condición de corte para leer solo el inicio del cuerpo
+        (ver HttpTransport.get).
+        """
+        if self._stopped():
+            # El consumidor de iter_company_records dejó de iterar: no más peticiones
+            return None
         try:
-            time.sleep(self.delay)
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
+            if self.retry_policy:
+                return self.retry_policy.call(url, lambda: self._get(url, headers, stop), self._stop)
+            return self._get(url, headers, stop)
         except Exception as e:
             logger.error(f"Error al obtener {url}: {e}")
             return None
 
-    def extract_jsonld_data(self, soup):
-        """Extrae datos de salarios desde tags <script type='application/ld+json'>"""
-        job_postings = []
-        company_info = {}
-
-        for script in soup.find_all('script', type='application/ld+json'):
-            try:
-                data = json.loads(script.string)
-            except (json.JSONDecodeError, TypeError):
-                continue
-
-            items = data if isinstance(data, list) else [data]
-            for item in items:
-                if not isinstance(item, dict):
-                    continue
-                item_type = item.get('@type', '')
-
-                if item_type == 'Organization':
-                    company_info = {
-                        'name': item.get('name', ''),
-                        'url': item.get('url', ''),
-                        'description': item.get('description', ''),
-                    }
-                elif item_type == 'JobPosting':
-                    job_postings.append(item)
+    def _stopped(self):
+        """True si el consumidor de iter_company_records dejó de iterar"""
+        return self._stop is not None and self._stop.is_set()
 
+    def _get(self, url, headers=None, stop=None):
+        """Un solo intento de descarga; lanza la excepción si falla"""
+        response = None
+        try:
+            if self.throttle:
+                self.metrics.observe('queue_wait', self.throttle.wait())
+            elif self._stop is not None:
+                # Espera interrumpible: al cortar iter_company_records no se agota el delay
+                self._stop.wait(self.delay)
+                self.metrics.observe('queue_wait', self.delay)
+            else:
+                time.sleep(self.delay)
+                self.metrics.observe('queue_wait', self.delay)
+            response = self.transport.get(url, headers=headers, stop=stop)
+            response.raise_for_status()
+            return response
+        finally:
+            if self.throttle:
+                self.throttle.observe(response)
+
+    def extract_jsonld_data(self, page):
+        """Extrae datos de salarios desde tags <script type='application/ld+json'>
+
+        `page` son los bytes de la respuesta (o str/soup); solo se decodifican
+        los bloques JSON-LD, sin construir el DOM.
+        """
+        organization, job_postings = extract_jsonld(page)
+        company_info = {}
+        if organization:
+            company_info = {
+                'name': organization.get('name', ''),
+                'url': organization.get('url', ''),
+                'description': organization.get('description', ''),
+            }
         return company_info, job_postings
 
-    def extract_from_nextjs_data(self, soup):
+    def extract_from_nextjs_data(self, page):
         """Extrae datos de los scripts __next_f.push (RSC payload)"""
         salary_entries = []
 
-        for script in soup.find_all('script'):
-            text = script.string or ''
-            if 'self.__next_f.push' not in text:
-                continue
-
+        for text in iter_nextjs_scripts(page):
             # Buscar patrones de salary_range en el payload
             salary_matches = re.findall(
                 r'"title"\s*:\s*"([^"]+)"[^}]*?"salary_range"\s*:\s*"([^"]+)"',
@@ -131,60 +186,86 @@ class SalariosScraperSimple:
 
     def parse_salary_range(self, salary_text):
         """Parsea texto de salario y extrae min, max, promedio"""
-        if not salary_text:
-            return None, None, None
-
-        # Limpiar
-        clean = salary_text.replace('S/', '').replace('PEN', '').replace(',', '').strip()
-
-        # Rango: "3600.00 - 5000.00"
-        range_match = re.search(r'(\d+\.?\d*)\s*-\s*(\d+\.?\d*)', clean)
-        if range_match:
-            salary_min = float(range_match.group(1))
-            salary_max = float(range_match.group(2))
-            return salary_min, salary_max, (salary_min + salary_max) / 2
-
-        # Valor único: "4600.00"
-        single_match = re.search(r'(\d+\.?\d*)', clean)
-        if single_match:
-            val = float(single_match.group(1))
-            return val, val, val
-
-        return None, None, None
+        return parse_salary(salary_text)
 
     def extract_salary_from_description(self, description):
         """Extrae rango salarial de la descripción del JobPosting"""
-        if not description:
-            return None
-        match = re.search(r'Rango salarial:\s*(S/[^.]+)', description)
-        if match:
-            return match.group(1).strip()
-        match = re.search(r'S/\s*[\d,]+\.?\d*(?:\s*-\s*S/\s*[\d,]+\.?\d*)?', description)
-        if match:
-            return match.group(0).strip()
-        return None
+        return extract_salary_text(description)
 
-    def extract_company_data(self, company_info_tuple):
-        """Extrae datos de salarios de una empresa"""
+    def _company_target(self, company_info_tuple):
+        """Retorna (slug, nombre, url) para una empresa o slug"""
         if isinstance(company_info_tuple, tuple):
-            company_slug, company_display_name = company_info_tuple
+            company_slug, company_display_name = canonical_slug(company_info_tuple[0]), company_info_tuple[1]
         else:
-            company_slug = company_info_tuple
-            company_display_name = unquote(company_slug).replace('-', ' ').title()
+            company_slug = canonical_slug(company_info_tuple)
+            company_display_name = (self.slug_cache and self.slug_cache.name(company_slug)) or slug_to_name(company_slug)
 
-        # Codificar slug para URL
-        encoded_slug = quote(company_slug, safe='-.')
-        company_url = f"{self.base_url}/empresa/{encoded_slug}"
+        # Codificar slug para URL (una sola vez, aunque viniera percent-encoded)
+        return company_slug, company_display_name, company_url(company_slug, self.base_url)
+
+    def extract_company_data(self, company_info_tuple):
+        """Extrae datos de salarios de una empresa (None si no se pudo descargar)"""
+        company_slug, company_display_name, company_url = self._company_target(company_info_tuple)
 
         logger.info(f"Procesando: {company_display_name}")
-        soup = self.get_page(company_url)
-        if not soup:
-            return []
+        download = self._download_company(company_slug, company_display_name, company_url)
+        if download is None:
+            return None
+        response, company_data = download
+        if company_data is None:
+            company_data = self._parse_timed(response.content, company_display_name, company_url)
+            if self.http_cache:
+                self.http_cache.store(company_url, response, company_data)
+        return company_data
+
+    def _download_company(self, company_slug, company_display_name, company_url):
+        """Descarga una empresa sin extraerla
+
+        Retorna None si falló, o (response, registros) donde registros ya viene
+        resuelto si el servidor respondió 304 y hay registros en cache.
+        """
+        headers = self.http_cache.conditional_headers(company_url) if self.http_cache else None
+        # Si el <head> no trae JobPosting se lee todo (fallbacks RSC / tablas);
+        # el archivo de páginas necesita siempre el documento completo
+        stop = JsonLdCutoff() if self.early_stop and not self.archive else None
+        response = self.fetch_page(company_url, headers, stop)
+        if response is None:
+            if not self._stopped():
+                self.metrics.inc('failures_total', reason='descarga')
+            return None
+
+        if response.status_code == 304:
+            cached = self.http_cache.cached_records(company_url)
+            if cached is not None:
+                logger.info(f"  -> sin cambios (304), {len(cached)} registros en cache")
+                self.metrics.inc('cache_hits_total', kind='304')
+                return None, cached
+            response = self.fetch_page(company_url, stop=stop)
+            if response is None:
+                if not self._stopped():
+                    self.metrics.inc('failures_total', reason='descarga')
+                return None
+
+        if self.archive:
+            self.archive.put(company_slug, company_url, response.content, name=company_display_name)
+        return response, None
+
+    def _parse_timed(self, content, company_display_name, company_url):
+        """parse_company_page registrando el tiempo y el método de extracción"""
+        start = time.perf_counter()
+        company_data = self.parse_company_page(content, company_display_name, company_url)
+        self.metrics.record_parse(self.extraction_method, company_data, time.perf_counter() - start)
+        return company_data
 
+    def parse_company_page(self, content, company_display_name, company_url):
+        """Extrae los registros de una página de empresa ya descargada (bytes)"""
         company_data = []
+        method = 'jsonld'
+        # Una marca de tiempo por página: todas las filas comparten el mismo string (ver RecordBuffer)
+        extracted_at = datetime.now().isoformat()
 
         # Método 1: Extraer de JSON-LD (Schema.org)
-        org_info, job_postings = self.extract_jsonld_data(soup)
+        org_info, job_postings = self.extract_jsonld_data(content)
 
         # Usar nombre real de la empresa si lo encontramos
         if org_info.get('name'):
@@ -221,12 +302,13 @@ class SalariosScraperSimple:
                     'url_empresa': company_url,
                     'fecha_inicio': date_posted,
                     'fecha_fin': valid_through,
-                    'fecha_extraccion': datetime.now().isoformat()
+                    'fecha_extraccion': extracted_at
                 })
 
         # Método 2: Si JSON-LD no dio resultados, intentar Next.js RSC payload
         if not company_data:
-            nextjs_entries = self.extract_from_nextjs_data(soup)
+            method = 'nextjs'
+            nextjs_entries = self.extract_from_nextjs_data(content)
             for entry in nextjs_entries:
                 salary_min, salary_max, salary_avg = self.parse_salary_range(entry.get('salary_range'))
                 company_data.append({
@@ -240,19 +322,23 @@ class SalariosScraperSimple:
                     'url_empresa': company_url,
                     'fecha_inicio': None,
                     'fecha_fin': None,
-                    'fecha_extraccion': datetime.now().isoformat()
+                    'fecha_extraccion': extracted_at
                 })
 
-        # Método 3: Fallback a tablas HTML (compatibilidad)
+        # Método 3: Fallback a tablas HTML (compatibilidad); único caso que necesita el DOM
         if not company_data:
+            method = 'html'
+            soup = content if isinstance(content, BeautifulSoup) else BeautifulSoup(content, 'html.parser')
             company_data = self.extract_from_html_tables(soup, company_display_name, company_url)
 
+        self.extraction_method = method if company_data else None
         logger.info(f"  -> {len(company_data)} registros de {company_display_name}")
         return company_data
 
     def extract_from_html_tables(self, soup, company_name, company_url):
         """Fallback: extrae datos de tablas HTML si existen"""
         data = []
+        extracted_at = datetime.now().isoformat()
         for table in soup.find_all('table'):
             rows = table.find_all('tr')
             for row in rows[1:]:
@@ -273,12 +359,23 @@ class SalariosScraperSimple:
                             'url_empresa': company_url,
                             'fecha_inicio': None,
                             'fecha_fin': None,
-                            'fecha_extraccion': datetime.now().isoformat()
+                            'fecha_extraccion': extracted_at
                         })
         return data
 
-    def scrape_companies(self, limit=5, use_all_companies=False):
-        """Extrae datos de empresas"""
+    def scrape_companies(self, limit=5, use_all_companies=False, resume=False, parse_workers=0,
+                         concurrency=4):
+        """Extrae datos de empresas
+
+        Si hay una frontera (self.frontier), el progreso se persiste por empresa
+        y con resume=True se retoma una ejecución interrumpida: se recuperan los
+        registros ya extraídos y solo se visitan las empresas pendientes o fallidas.
+
+        Con parse_workers > 0, `concurrency` hilos descargan y las páginas se
+        parsean en un pool de procesos (ver crawl_pipeline).
+
+        Retorna el RecordBuffer con los registros (vacío con sinks).
+        """
         if use_all_companies:
             companies_to_scrape = self.all_companies[:limit] if limit else self.all_companies
             logger.info(f"Scraping COMPLETO de {len(companies_to_scrape)} empresas...")
@@ -286,32 +383,185 @@ class SalariosScraperSimple:
             companies_to_scrape = self.test_companies[:limit]
             logger.info(f"Scraping de prueba de {len(companies_to_scrape)} empresas...")
 
-        successful = 0
-        failed = 0
+        if self.frontier:
+            self.frontier.seed(companies_to_scrape, resume=resume)
+            if resume:
+                self._emit(self.frontier.journal_records())
+                companies_to_scrape = self.frontier.pending(companies_to_scrape)
+                logger.info(f"Retomando: {self.records_count} registros recuperados, "
+                            f"{len(companies_to_scrape)} empresas pendientes")
+
+        for records in self.iter_company_records(companies_to_scrape, parse_workers, concurrency):
+            self._store(records)
+
+        logger.info(f"Scraping completado! OK: {self.counts['ok']} | Fail: {self.counts['fail']} | Total registros: {self.records_count}")
+        return self.salary_data
 
-        for i, company in enumerate(companies_to_scrape, 1):
+    def iter_company_records(self, companies, parse_workers=0, concurrency=4, max_pending=None):
+        """Genera la lista de registros de cada empresa con datos, a medida que se extrae
+
+        El crawl corre en un hilo y se frena si hay `max_pending` empresas sin
+        consumir; si se deja de iterar, no se hacen más peticiones (las
+        empresas restantes quedan pendientes en la frontera). Con
+        parse_workers > 0, `concurrency` hilos descargan y las páginas se
+        parsean en un pool de procesos (ver crawl_pipeline).
+        """
+        def produce(emit, stop):
+            self._outbox, self._stop = emit, stop
+            if self._cancelled:
+                stop.set()
             try:
-                company_data = self.extract_company_data(company)
-                if company_data:
-                    self.salary_data.extend(company_data)
-                    successful += 1
-                else:
-                    failed += 1
-                    logger.warning(f"  Sin datos para {company[1] if isinstance(company, tuple) else company}")
-            except Exception as e:
-                failed += 1
-                logger.error(f"  Error en {company}: {e}")
+                self._crawl_with_retry(companies, parse_workers, concurrency)
+            finally:
+                self._outbox = self._stop = None
+
+        return iter_in_thread(produce, max_pending or max(2, 2 * concurrency))
+
+    def stop(self):
+        """Corta el crawl en curso desde otro hilo (p. ej. al perder el lease del shard)"""
+        self._cancelled = True
+        stop = self._stop
+        if stop is not None:
+            stop.set()
+
+    def _crawl_with_retry(self, companies, parse_workers, concurrency):
+        """Recorre las empresas, reintenta una vez las fallidas y resume las métricas (en el hilo del crawl)"""
+        counts = self.counts = {'ok': 0, 'fail': 0}
+        # Empresas cuya descarga falló: se reintentan una vez al final
+        retry_later = self._crawl(companies, counts, parse_workers, concurrency)
+        if retry_later and not self._stopped():
+            logger.warning(f"Reintentando al final {len(retry_later)} empresas con descarga fallida")
+            retry_later = self._crawl(retry_later, counts, parse_workers, concurrency)
+        if not self._stopped():
+            # Si se cortó, las empresas sin descargar siguen pendientes en la frontera
+            counts['fail'] += len(retry_later)
+
+        if self.throttle:
+            logger.info(f"Ritmo adaptativo: {self.throttle.metrics()}")
+            self.metrics.absorb('throttle', self.throttle.metrics())
+        if self.retry_policy:
+            logger.info(f"Reintentos: {self.retry_policy.metrics()}")
+            self.metrics.absorb('retry', self.retry_policy.metrics())
+        logger.info(f"Tráfico HTTP: {self.transport.metrics()}")
+        self.metrics.absorb('transport', self.transport.metrics())
+
+    def _crawl(self, companies, counts, parse_workers=0, concurrency=4):
+        """Procesa las empresas sumando a counts; retorna las que no se pudieron descargar"""
+        if parse_workers:
+            return self._crawl_pipelined(companies, counts, parse_workers, concurrency)
+
+        retry_later = []
+        for i, company in enumerate(companies, 1):
+            if self._stopped():
+                break
+            ok = self._scrape_one(company)
+            if ok is None and self._stopped():
+                # Cortada por el consumidor: no es un fallo de descarga
+                break
+            if ok is None:
+                retry_later.append(company)
+            else:
+                counts['ok' if ok else 'fail'] += 1
 
             if i % 10 == 0:
-                logger.info(f"Progreso: {i}/{len(companies_to_scrape)} | OK: {successful} | Fail: {failed} | Registros: {len(self.salary_data)}")
+                logger.info(f"Progreso: {i}/{len(companies)} | OK: {counts['ok']} | Fail: {counts['fail']} | Registros: {self.records_count}")
+        return retry_later
+
+    def _crawl_pipelined(self, companies, counts, parse_workers, concurrency):
+        """Descargas en `concurrency` hilos + parseo en `parse_workers` procesos"""
+        if self.transport.pool_size < concurrency:
+            self.transport.resize_pool(concurrency)
+        total = len(companies)
+
+        def fetch(company):
+            if self._stopped():
+                return None
+            slug, display_name, company_url = self._company_target(company)
+            logger.info(f"Procesando: {display_name}")
+            download = self._download_company(slug, display_name, company_url)
+            if download is None:
+                if self.frontier and not self._stopped():
+                    self.frontier.mark_failed(slug, 'descarga fallida')
+                return None
+            response, company_data = download
+            if company_data is not None:
+                return company_data
+            return (response.content, slug, display_name, company_url), response
+
+        def deliver(company, parsed, response):
+            if response is None:
+                company_data = parsed
+            else:
+                company_data, method, seconds = parsed
+                self.metrics.record_parse(method, company_data, seconds)
+                if self.http_cache:
+                    _, _, company_url = self._company_target(company)
+                    self.http_cache.store(company_url, response, company_data)
+            counts['ok' if self._record_outcome(company, company_data) else 'fail'] += 1
+
+            done = counts['ok'] + counts['fail']
+            if done % 10 == 0:
+                logger.info(f"Progreso: {done}/{total} | OK: {counts['ok']} | Fail: {counts['fail']} | Registros: {self.records_count}")
+
+        return run_pipeline(companies, fetch, reparse_page_timed, deliver,
+                            concurrency=concurrency, parse_workers=parse_workers)
+
+    def _scrape_one(self, company):
+        """Procesa una empresa: True si extrajo datos, False si no, None si no se pudo descargar"""
+        slug = company[0] if isinstance(company, tuple) else company
+        try:
+            company_data = self.extract_company_data(company)
+        except Exception as e:
+            logger.error(f"  Error en {company}: {e}")
+            if self.frontier:
+                self.frontier.mark_failed(slug, e)
+            return False
+        return self._record_outcome(company, company_data)
+
+    def _record_outcome(self, company, company_data):
+        """Registra en la frontera y emite el resultado de una empresa (ver _scrape_one)"""
+        slug = company[0] if isinstance(company, tuple) else company
+        if company_data is None:
+            if self.frontier and not self._stopped():
+                self.frontier.mark_failed(slug, 'descarga fallida')
+            return None
+        if not company_data:
+            logger.warning(f"  Sin datos para {company[1] if isinstance(company, tuple) else company}")
+            self.metrics.inc('failures_total', reason='sin_datos')
+            if self.frontier:
+                self.frontier.mark_failed(slug, 'sin datos')
+            return False
 
-        logger.info(f"Scraping completado! OK: {successful} | Fail: {failed} | Total registros: {len(self.salary_data)}")
-        return self.salary_data
+        if self.frontier:
+            self.frontier.mark_done(slug, company_data)
+        if self.slug_cache:
+            self.slug_cache.put(slug, company_data[0]['empresa'], base_url=self.base_url)
+        self._emit(company_data)
+        return True
+
+    def _emit(self, records):
+        """Entrega registros al consumidor de iter_company_records o los guarda"""
+        if self._outbox is not None:
+            self._outbox(records)
+        else:
+            self._store(records)
+
+    def _store(self, records):
+        """Escribe registros en los sinks (streaming) o los acumula en memoria"""
+        if self.sinks:
+            before = self.sinks.count
+            self.sinks.write(records)
+            self.records_count += self.sinks.count - before
+        else:
+            before = len(self.salary_data)
+            self.salary_data.extend(records)
+            self.records_count += len(self.salary_data) - before
 
-    def scrape_all_companies(self, max_companies=None):
+    def scrape_all_companies(self, max_companies=None, resume=False, parse_workers=0, concurrency=4):
         """Hace scraping de TODAS las empresas disponibles"""
         limit = max_companies if max_companies else len(self.all_companies)
-        return self.scrape_companies(limit=limit, use_all_companies=True)
+        return self.scrape_companies(limit=limit, use_all_companies=True, resume=resume,
+                                     parse_workers=parse_workers, concurrency=concurrency)
 
     def save_to_csv(self, filename='salarios_peru.csv'):
         """Guarda los datos en CSV"""
@@ -319,7 +569,7 @@ class SalariosScraperSimple:
             logger.warning("No hay datos para guardar")
             return
 
-        df = pd.DataFrame(self.salary_data)
+        df = self.salary_data.to_dataframe()
         df.to_csv(filename, index=False, encoding='utf-8')
         logger.info(f"Datos guardados en {filename}")
 
@@ -330,7 +580,7 @@ class SalariosScraperSimple:
             return
 
         conn = sqlite3.connect(db_name)
-        df = pd.DataFrame(self.salary_data)
+        df = self.salary_data.to_dataframe()
         df.to_sql('salarios', conn, if_exists='replace', index=False)
 
         cursor = conn.cursor()
@@ -387,7 +637,8 @@ class SalariosScraperSimple:
                     %(url_empresa)s, %(fecha_inicio)s, %(fecha_fin)s, %(fecha_extraccion)s)
             """
 
-            cursor.executemany(insert_query, self.salary_data)
+            for batch in self.salary_data.iter_batches():
+                cursor.executemany(insert_query, batch)
             conn.commit()
             cursor.close()
             conn.close()
@@ -406,7 +657,7 @@ class SalariosScraperSimple:
             logger.warning("No hay datos para analizar")
             return
 
-        df = pd.DataFrame(self.salary_data)
+        df = self.salary_data.to_dataframe()
 
         # Filtrar registros con salario válido
         df_valid = df[df['salario_promedio'].notna() & (df['salario_promedio'] > 0)]
@@ -444,13 +695,110 @@ class SalariosScraperSimple:
                 print(unis['universidad_principal'].value_counts().head(10))
 
 
+_reparse_scraper = None
+
+
+def reparse_page(content, slug, name, url):
+    """Extracción sin red para --reparse (se ejecuta en los procesos del pool)"""
+    global _reparse_scraper
+    if _reparse_scraper is None:
+        _reparse_scraper = SalariosScraperSimple(delay=0)
+    display_name = name or slug_to_name(slug)
+    return _reparse_scraper.parse_company_page(content, display_name, url)
+
+
+def reparse_page_timed(content, slug, name, url):
+    """reparse_page para el pipeline: retorna (registros, método, segundos) para las métricas"""
+    start = time.perf_counter()
+    records = reparse_page(content, slug, name, url)
+    return records, _reparse_scraper.extraction_method, time.perf_counter() - start
+
+
+def build_sinks(suffix, use_mysql=False):
+    """Crea los sinks de streaming: CSV + MySQL (o SQLite si MySQL no está disponible)"""
+    sinks = [CsvSink(f'salarios_{suffix}.csv')]
+    if use_mysql:
+        try:
+            from mysql_config import MYSQL_CONFIG
+            sinks.append(MysqlSink(MYSQL_CONFIG))
+            return SinkPipeline(sinks)
+        except ImportError:
+            logger.error("mysql-connector-python no instalado")
+        except Exception as e:
+            logger.error(f"Error MySQL: {e}")
+    sinks.append(SqliteSink(f'salarios_{suffix}.db'))
+    return SinkPipeline(sinks)
+
+
+def run_reparse(archive_dir, workers=None, stream=False, use_mysql=False):
+    """Re-ejecuta la extracción sobre el archivo de páginas, en paralelo y sin red"""
+    print(f"Salarios Peru - Re-parseo del archivo {archive_dir}")
+    print("=" * 60)
+
+    scraper = SalariosScraperSimple(delay=0, use_mysql=use_mysql)
+    if stream:
+        scraper.sinks = build_sinks('reparse', use_mysql)
+
+    archive = PageArchive(archive_dir)
+    for records in reparse_archive(archive, reparse_page, workers=workers):
+        scraper._emit(records)
+    archive.close()
+
+    print(f"\nTotal registros re-extraidos: {scraper.records_count}")
+    if stream:
+        scraper.sinks.close()
+        return
+
+    scraper.save_to_csv('salarios_reparse.csv')
+    if not (use_mysql and scraper.save_to_mysql()):
+        scraper.save_to_sqlite('salarios_reparse.db')
+    scraper.generate_report()
+
+
+def shard_suffix(suffix, index, total):
+    """Sufijo de los archivos de la partición de un shard (p. ej. 'completo_shard0de4')"""
+    return f'{suffix}_shard{index}de{total}'
+
+
+def run_merge(suffix, total, use_mysql=False, shard_db='shards.db'):
+    """Combina las particiones de los `total` shards en salarios_{suffix}.csv / .db (o MySQL)"""
+    print(f"Salarios Peru - Combinando {total} shards en salarios_{suffix}")
+    print("=" * 60)
+
+    leases = ShardLeases(shard_db)
+    status = leases.status(total)
+    leases.close()
+    pending = [i for i in range(total) if not status.get(i, {}).get('finished')]
+    if pending:
+        logger.warning(f"Shards sin terminar: {pending}; se combinan las particiones disponibles")
+
+    paths = [f'salarios_{shard_suffix(suffix, i, total)}.db' for i in range(total)]
+    with build_sinks(suffix, use_mysql) as sinks:
+        merged = merge_partitions(paths, sinks)
+    print(f"\nTotal registros combinados: {merged}")
+
+
 def main():
     """Función principal"""
     import sys
 
     use_mysql = '--use-mysql' in sys.argv
     full_scraping = '--all' in sys.argv or '--full' in sys.argv
+    resume = '--resume' in sys.argv
+    stream = '--stream' in sys.argv
+    adaptive = '--adaptive' in sys.argv
+    early_stop = '--early-stop' in sys.argv
     max_companies = None
+    http_cache = None
+    archive = None
+    reparse_dir = None
+    workers = None
+    parse_workers = 0
+    concurrency = 4
+    metrics_path = None
+    shard = None
+    merge_shards = None
+    shard_db = 'shards.db'
 
     for arg in sys.argv:
         if arg.startswith('--limit='):
@@ -458,6 +806,52 @@ def main():
                 max_companies = int(arg.split('=')[1])
             except ValueError:
                 print("Formato invalido. Usa: --limit=50")
+        elif arg == '--http-cache' or arg.startswith('--http-cache='):
+            http_cache = HttpValidatorCache(arg.split('=', 1)[1] if '=' in arg else 'http_cache.db')
+        elif arg == '--archive' or arg.startswith('--archive='):
+            archive = PageArchive(arg.split('=', 1)[1] if '=' in arg else 'archivo_paginas')
+        elif arg == '--reparse' or arg.startswith('--reparse='):
+            reparse_dir = arg.split('=', 1)[1] if '=' in arg else 'archivo_paginas'
+        elif arg.startswith('--workers='):
+            try:
+                workers = int(arg.split('=')[1])
+            except ValueError:
+                print("Formato invalido. Usa: --workers=4")
+        elif arg.startswith('--parse-workers='):
+            try:
+                parse_workers = int(arg.split('=')[1])
+            except ValueError:
+                print("Formato invalido. Usa: --parse-workers=4")
+        elif arg.startswith('--concurrency='):
+            try:
+                concurrency = int(arg.split('=')[1])
+            except ValueError:
+                print("Formato invalido. Usa: --concurrency=8")
+        elif arg == '--metrics' or arg.startswith('--metrics='):
+            metrics_path = arg.split('=', 1)[1] if '=' in arg else 'metricas_crawl'
+        elif arg == '--shard' or arg.startswith('--shard='):
+            # --shard=i/N o --shard i/N (i desde 0; 'auto/N' toma el primer shard libre)
+            value = arg.split('=', 1)[1] if '=' in arg else next(iter(sys.argv[sys.argv.index(arg) + 1:]), '')
+            try:
+                shard = parse_shard(value)
+            except ValueError:
+                print("Formato invalido. Usa: --shard=0/4 o --shard=auto/4")
+                return
+        elif arg.startswith('--shard-db='):
+            shard_db = arg.split('=', 1)[1]
+        elif arg.startswith('--merge-shards='):
+            try:
+                merge_shards = int(arg.split('=')[1])
+            except ValueError:
+                print("Formato invalido. Usa: --merge-shards=4")
+
+    if reparse_dir:
+        run_reparse(reparse_dir, workers, stream, use_mysql)
+        return
+
+    if merge_shards:
+        run_merge('completo' if full_scraping else 'simple', merge_shards, use_mysql, shard_db)
+        return
 
     if full_scraping:
         label = f"COMPLETO (limite: {max_companies})" if max_companies else "COMPLETO (TODAS)"
@@ -468,18 +862,64 @@ def main():
     print(f"DB: {'MySQL' if use_mysql else 'SQLite'}")
     print("=" * 60)
 
-    scraper = SalariosScraperSimple(delay=2, use_mysql=use_mysql)
+    suffix = 'completo' if full_scraping else 'simple'
+    leases = None
+    if shard:
+        index, total = shard
+        leases = ShardLeases(shard_db)
+        if index is None:
+            # --shard=auto/N: el primer shard libre
+            index = leases.acquire_any(total)
+        elif not leases.acquire(index, total):
+            index = None
+        if index is None:
+            print(f"No hay shards libres de {total} (ver {shard_db})")
+            leases.close()
+            return
+        shard = (index, total)
+        print(f"Shard {index}/{total} (leases en {shard_db})")
+        # Cada shard escribe su propia partición; MySQL se llena recién al combinar
+        suffix = shard_suffix(suffix, index, total)
+        use_mysql = False
+    frontier = CrawlFrontier(f'crawl_frontier_{suffix}.db')
+    scraper = SalariosScraperSimple(delay=2, use_mysql=use_mysql, http_cache=http_cache,
+                                    frontier=frontier, archive=archive,
+                                    throttle=AdaptiveThrottle() if adaptive else None,
+                                    retry_policy=RetryPolicy(), early_stop=early_stop,
+                                    slug_cache=SlugCache())
+    if shard:
+        scraper.all_companies = filter_shard(scraper.all_companies, *shard)
+        scraper.test_companies = filter_shard(scraper.test_companies, *shard)
     print(f"Empresas disponibles: {len(scraper.all_companies)}")
 
+    if stream:
+        scraper.sinks = build_sinks(suffix, use_mysql)
+
+    completed = False
     try:
-        if full_scraping:
-            data = scraper.scrape_all_companies(max_companies=max_companies)
-            suffix = 'completo'
-        else:
-            data = scraper.scrape_companies(limit=15)
-            suffix = 'simple'
+        # En modo shard el lease se renueva mientras dura el crawl
+        with leases.hold(*shard, on_lost=scraper.stop) if leases else nullcontext() as keeper:
+            if full_scraping:
+                data = scraper.scrape_all_companies(max_companies=max_companies, resume=resume,
+                                                    parse_workers=parse_workers, concurrency=concurrency)
+            else:
+                data = scraper.scrape_companies(limit=15, resume=resume, parse_workers=parse_workers,
+                                                concurrency=concurrency)
+
+        if keeper is not None and keeper.lost:
+            # Otro nodo tomó el shard: su partición es la que vale, esta queda sin escribir
+            if stream:
+                scraper.sinks.close()
+            print(f"Se perdió el lease del shard {shard[0]}/{shard[1]}; progreso en {frontier.db_path}")
+            return
 
-        print(f"\nTotal registros extraidos: {len(data)}")
+        print(f"\nTotal registros extraidos: {scraper.records_count}")
+
+        if stream:
+            scraper.sinks.close()
+            completed = True
+            print(f"Registros escritos a medida que se extraian en salarios_{suffix}.csv")
+            return
 
         csv_file = f'salarios_{suffix}.csv'
         scraper.save_to_csv(csv_file)
@@ -491,12 +931,13 @@ def main():
         else:
             db_file = f'salarios_{suffix}.db'
             scraper.save_to_sqlite(db_file)
+        completed = True
 
         scraper.generate_report()
 
         if data:
-            empresas = len(set(item['empresa'] for item in data))
-            con_salario = len([d for d in data if d.get('salario_promedio')])
+            empresas = len(set(data.column('empresa')))
+            con_salario = sum(1 for salario in data.column('salario_promedio') if salario)
             print(f"\nResumen: {empresas} empresas, {len(data)} registros, {con_salario} con salario")
 
         print(f"\nComandos:")
@@ -504,14 +945,43 @@ def main():
         print("  python scraper_simple.py --all              # Todas las empresas")
         print("  python scraper_simple.py --all --limit=50   # Primeras 50")
         print("  python scraper_simple.py --use-mysql        # Con MySQL")
+        print("  python scraper_simple.py --all --http-cache # Solo re-procesa paginas modificadas")
+        print("  python scraper_simple.py --all --resume     # Retoma un scraping interrumpido")
+        print("  python scraper_simple.py --all --stream     # Escribe CSV/DB mientras extrae")
+        print("  python scraper_simple.py --all --archive    # Guarda las paginas comprimidas")
+        print("  python scraper_simple.py --reparse          # Re-extrae del archivo, sin red")
+        print("  python scraper_simple.py --all --adaptive   # Ritmo adaptativo en vez de 2s fijos")
+        print("  python scraper_simple.py --all --early-stop # Corta la descarga tras el JSON-LD")
+        print("  python scraper_simple.py --all --parse-workers=4 --concurrency=8  # Parseo en procesos")
+        print("  python scraper_simple.py --all --metrics    # Exporta metricas_crawl.prom/.json")
+        print("  python scraper_simple.py --all --shard=0/4  # Solo el shard 0 de 4 (auto/4: el primero libre)")
+        print("  python scraper_simple.py --all --merge-shards=4  # Combina las particiones de los shards")
         print("  python update_empresas.py                   # Actualizar lista de empresas")
 
     except KeyboardInterrupt:
         print("\nInterrumpido por el usuario")
+        if scraper.sinks:
+            scraper.sinks.close()
+        print(f"Progreso guardado en {frontier.db_path}: {frontier.summary()}")
+        print("Usa --resume para continuar donde se quedo")
     except Exception as e:
         logger.error(f"Error: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        if leases:
+            # Un shard interrumpido queda libre para que otro nodo lo retome (con --resume)
+            if completed:
+                if not leases.finish(*shard, scraper.records_count):
+                    logger.error(f"No se pudo marcar el shard {shard[0]}/{shard[1]} como finalizado: "
+                                 f"el lease ya es de otro nodo")
+            else:
+                leases.release(*shard)
+            leases.close()
+        if metrics_path:
+            # También tras una interrupción: las métricas parciales sirven para ver dónde se fue el tiempo
+            prom, summary = scraper.metrics.export(metrics_path)
+            print(f"Métricas: {prom} / {summary}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Lectura del sitemap.xml de SalariosPerú.com
+Retorna los slugs de empresas (canónicos, ver company_slugs) junto con su <lastmod>.
+
+El XML se procesa en streaming (iterparse) liberando cada nodo al terminar,
+así que la memoria no crece con el número de empresas. Soporta índices de
+sitemaps (<sitemapindex>) y sitemaps comprimidos (.xml.gz).
+"""
+
+import gzip
+import io
+import re
+import xml.etree.ElementTree as ET
+from urllib.parse import urljoin
+
+from company_slugs import canonical_slug
+
+EMPRESA_URL_RE = re.compile(r'^https?://(?:www\.)?salariosperu\.com/empresa/(.+)$')
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def _local_name(tag):
+    """'{http://www.sitemaps.org/schemas/sitemap/0.9}url' -> 'url'"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _maybe_gunzip(stream):
+    """Descomprime al vuelo si el contenido viene en gzip (.xml.gz sin Content-Encoding)"""
+    if not isinstance(stream, io.BufferedReader):
+        stream = io.BufferedReader(stream)
+    if stream.peek(2)[:2] == GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=stream)
+    return stream
+
+
+def iter_sitemap_nodes(stream):
+    """Itera ('url' | 'sitemap', loc, lastmod) de un sitemap o índice, en streaming"""
+    root = None
+    loc = lastmod = None
+    for event, node in ET.iterparse(_maybe_gunzip(stream), events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = node
+            continue
+        name = _local_name(node.tag)
+        # Solo el primer <loc> de cada entrada (los de image:loc, etc. se ignoran)
+        if name == 'loc' and loc is None:
+            loc = (node.text or '').strip()
+        elif name == 'lastmod' and lastmod is None:
+            lastmod = (node.text or '').strip() or None
+        elif name in ('url', 'sitemap'):
+            if loc:
+                yield name, loc, lastmod
+            loc = lastmod = None
+            # Liberar las entradas ya procesadas
+            root.clear()
+
+
+def company_entry(loc, lastmod):
+    """(slug canónico, lastmod) si `loc` es una URL /empresa/ válida, si no None"""
+    match = EMPRESA_URL_RE.match(loc or '')
+    if not match:
+        return None
+    slug = canonical_slug(match.group(1))
+    # Filtrar el slug "None" (bug conocido del sitemap)
+    if slug and slug != 'None':
+        return slug, lastmod
+    return None
+
+
+def parse_sitemap(xml_text):
+    """Retorna una lista de (slug, lastmod) para las URLs /empresa/ del sitemap"""
+    if isinstance(xml_text, str):
+        xml_text = xml_text.encode('utf-8')
+    entries = []
+    for kind, loc, lastmod in iter_sitemap_nodes(io.BytesIO(xml_text)):
+        entry = company_entry(loc, lastmod) if kind == 'url' else None
+        if entry:
+            entries.append(entry)
+    return entries
+
+
+def iter_sitemap(url, transport, max_depth=3):
+    """Itera (slug, lastmod) de las empresas del sitemap en `url`, siguiendo índices
+
+    Genera los resultados a medida que se leen; los sitemaps hijos de un índice
+    se descargan uno tras otro (solo se guardan sus URLs, no su contenido).
+    """
+    response = transport.open(url)
+    children = []
+    try:
+        response.raise_for_status()
+        for kind, loc, lastmod in iter_sitemap_nodes(transport.reader(response)):
+            if kind == 'sitemap':
+                # Un <loc> absoluto se sigue tal cual (puede estar en otro host, p. ej. un CDN)
+                children.append(urljoin(url, loc.strip()))
+                continue
+            entry = company_entry(loc, lastmod)
+            if entry:
+                yield entry
+    finally:
+        response.close()
+
+    if children and max_depth > 0:
+        for child in children:
+            yield from iter_sitemap(child, transport, max_depth - 1)
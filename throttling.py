@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Control de ritmo de peticiones para los scrapers de SalariosPerú.com
+- TokenBucket / HostRateLimiter: token bucket por host, desde hilos o asyncio.
+- AdaptiveThrottle: ritmo AIMD que se adapta a latencia, 429/5xx y Retry-After.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket clásico: `rate` tokens por segundo, hasta `capacity` acumulados"""
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError("rate debe ser mayor que 0")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self.updated
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+    def reserve(self, tokens=1):
+        """Reserva tokens y retorna cuántos segundos hay que esperar para usarlos"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= tokens
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self, tokens=1):
+        """Bloquea el hilo actual hasta disponer de los tokens"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens=1):
+        """Versión asyncio de acquire(): no bloquea el event loop"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """Mantiene un TokenBucket independiente por host"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url):
+        """Retorna el bucket asociado al host de la URL"""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url):
+        return self.bucket(url).acquire()
+
+    async def acquire_async(self, url):
+        return await self.bucket(url).acquire_async()
+
+
+def retry_after_seconds(value):
+    """Interpreta un header Retry-After (segundos o fecha HTTP); None si no es válido"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class AdaptiveThrottle:
+    """Control de ritmo AIMD (aumento aditivo / disminución multiplicativa)
+
+    Espacia las peticiones a `rate` peticiones/segundo (globalmente, no por
+    hilo). Cada respuesta sana suma `increase` al ritmo; un 429, un 5xx, un
+    error de red o una latencia mayor que `target_latency` lo multiplican por
+    `decrease`. Las bajadas se aplican como máximo una vez por `cooldown`
+    segundos para que una ráfaga de fallos simultáneos no lo hunda, y un
+    Retry-After detiene todas las peticiones hasta que venza.
+    """
+
+    def __init__(self, rate=0.5, min_rate=0.05, max_rate=10.0, increase=0.1, decrease=0.5,
+                 target_latency=3.0, cooldown=1.0):
+        if not 0 < min_rate <= max_rate:
+            raise ValueError("se requiere 0 < min_rate <= max_rate")
+        self.rate = min(max(rate, min_rate), max_rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.target_latency = target_latency
+        self.cooldown = cooldown
+        self.stats = {'increases': 0, 'decreases': 0, 'retry_after_waits': 0}
+        self._next_slot = time.monotonic()
+        self._blocked_until = 0.0
+        self._last_decrease = float('-inf')
+        self._logged_rate = self.rate
+        self._lock = threading.Lock()
+
+    @property
+    def delay(self):
+        """Pausa actual entre peticiones, en segundos"""
+        return 1.0 / self.rate
+
+    def reserve(self):
+        """Reserva el próximo turno y retorna cuántos segundos hay que esperar"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot, self._blocked_until)
+            self._next_slot = slot + 1.0 / self.rate
+        return slot - now
+
+    def wait(self):
+        """Bloquea hasta el próximo turno libre"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def wait_async(self):
+        """Versión asyncio de wait()"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def record(self, status=None, latency=None, retry_after=None, error=False):
+        """Ajusta el ritmo según el resultado de una petición"""
+        with self._lock:
+            now = time.monotonic()
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+                self.stats['retry_after_waits'] += 1
+
+            if error or status == 429 or (status is not None and status >= 500):
+                if not error:
+                    reason = f'HTTP {status}'
+                else:
+                    reason = 'error de red' if status is None else f'error (HTTP {status})'
+            elif latency is not None and latency > self.target_latency:
+                reason = f'latencia {latency:.1f}s'
+            else:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+                self.stats['increases'] += 1
+                if self.rate >= self._logged_rate * 1.25:
+                    self._log_rate('sitio estable')
+                return
+
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self.stats['decreases'] += 1
+            self._log_rate(reason)
+
+    def observe(self, response=None, error=False):
+        """Registra una respuesta de requests (None = la petición falló)
+
+        Con error=True cuenta como fallo aunque haya respuesta (p. ej. un
+        cuerpo cortado a mitad de la lectura).
+        """
+        if response is None:
+            self.record(error=True)
+            return
+        self.record(status=response.status_code,
+                    latency=response.elapsed.total_seconds(),
+                    retry_after=retry_after_seconds(response.headers.get('Retry-After')),
+                    error=error)
+
+    def _log_rate(self, reason):
+        logger.info(f"Ritmo ajustado a {self.rate:.2f} req/s ({reason})")
+        self._logged_rate = self.rate
+
+    def metrics(self):
+        """Ritmo actual y contadores de ajustes"""
+        return {'rate': round(self.rate, 3), 'min_rate': self.min_rate, 'max_rate': self.max_rate,
+                **self.stats}
@@ -1,177 +1,167 @@
 #!/usr/bin/env python3
 """
 Actualiza la lista de empresas desde el sitemap de SalariosPerú.com
-Genera/actualiza empresas_auto.py con todos los slugs disponibles.
+Genera/actualiza el registro de empresas (empresas.json) con todos los slugs disponibles.
+Los nombres reales ya resueltos se leen de slug_cache.db y no se vuelven a descargar.
 """
 
 import requests
 import re
-import json
-import time
 import logging
-from datetime import datetime
-from bs4 import BeautifulSoup
-from urllib.parse import unquote
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from company_registry import REGISTRY_PATH, write_registry
+from company_slugs import BASE_URL, SlugCache, company_url, has_special_chars, slug_to_name
+from http_transport import HttpTransport
+from jsonld_extractor import iter_jsonld
+from sitemap_reader import iter_sitemap
+from throttling import AdaptiveThrottle
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-BASE_URL = "https://salariosperu.com"
-
-
 def fetch_sitemap():
-    """Descarga y parsea el sitemap.xml para obtener slugs de empresas"""
+    """Descarga y parsea el sitemap.xml (o índice de sitemaps) para obtener slugs de empresas"""
     logger.info("Descargando sitemap.xml...")
-    response = requests.get(f"{BASE_URL}/sitemap.xml", timeout=15)
-    response.raise_for_status()
-
-    # Extraer URLs de empresas
-    empresa_urls = re.findall(r'<loc>https?://(?:www\.)?salariosperu\.com/empresa/([^<]+)</loc>', response.text)
-
-    # Filtrar el slug "None" (bug conocido del sitemap)
-    empresa_slugs = [slug.strip() for slug in empresa_urls if slug.strip() and slug.strip() != 'None']
+    # iter_sitemap ya filtra el slug "None" (bug conocido del sitemap) y canonicaliza los slugs
+    transport = HttpTransport(pool_size=1)
+    empresa_slugs = list(dict.fromkeys(slug for slug, _ in iter_sitemap(f"{BASE_URL}/sitemap.xml", transport)))
 
     logger.info(f"Encontrados {len(empresa_slugs)} slugs de empresas en el sitemap")
     return empresa_slugs
 
 
-def fetch_company_name(slug, session):
-    """Obtiene el nombre real de la empresa desde su página usando JSON-LD"""
-    url = f"{BASE_URL}/empresa/{slug}"
-    try:
-        response = session.get(url, timeout=10)
-        if response.status_code != 200:
-            return None
+TITLE_RE = re.compile(rb'<title[^>]*>(.*?)</title>', re.S | re.I)
 
-        soup = BeautifulSoup(response.content, 'html.parser')
 
-        # Buscar en JSON-LD
-        for script in soup.find_all('script', type='application/ld+json'):
-            try:
-                data = json.loads(script.string)
-                if isinstance(data, dict):
-                    if data.get('@type') == 'Organization':
-                        return data.get('name')
-                    if 'hiringOrganization' in data:
-                        return data['hiringOrganization'].get('name')
-                elif isinstance(data, list):
-                    for item in data:
-                        if isinstance(item, dict) and item.get('@type') == 'Organization':
-                            return item.get('name')
-            except (json.JSONDecodeError, TypeError):
-                continue
-
-        # Fallback: título de la página
-        title = soup.find('title')
-        if title:
-            match = re.search(r'Salarios en (.+?)(?:\s*[-|])', title.get_text())
-            if match:
-                return match.group(1).strip()
+def resolve_company_name(content):
+    """Obtiene el nombre real de la empresa de una página ya descargada (JSON-LD o <title>)"""
+    for data in iter_jsonld(content):
+        if isinstance(data, dict):
+            if data.get('@type') == 'Organization':
+                return data.get('name')
+            if isinstance(data.get('hiringOrganization'), dict):
+                return data['hiringOrganization'].get('name')
+        elif isinstance(data, list):
+            for item in data:
+                if isinstance(item, dict) and item.get('@type') == 'Organization':
+                    return item.get('name')
 
-        return None
-    except Exception as e:
-        logger.debug(f"Error obteniendo nombre para {slug}: {e}")
-        return None
+    # Fallback: título de la página
+    title = TITLE_RE.search(content)
+    if title:
+        match = re.search(r'Salarios en (.+?)(?:\s*[-|])', title.group(1).decode('utf-8', errors='replace'))
+        if match:
+            return match.group(1).strip()
 
+    return None
 
-def slug_to_name(slug):
-    """Convierte un slug a un nombre legible como fallback"""
-    name = unquote(slug)
-    # Manejar sufijos comunes
-    name = name.replace('-s-a-', ' S.A.')
-    name = name.replace('-s.a.', ' S.A.')
-    name = name.replace('-sac', ' SAC')
-    name = name.replace('-saa', ' SAA')
-    name = name.replace('-s-a-c-', ' S.A.C.')
-    name = name.replace('-', ' ')
-    # Capitalizar cada palabra
-    return name.title()
 
+def fetch_company_page(slug, transport, throttle=None):
+    """Descarga la página de una empresa; retorna los bytes o None"""
+    if throttle:
+        throttle.wait()
+    try:
+        response = transport.get(company_url(slug), timeout=10)
+    except requests.RequestException as e:
+        logger.debug(f"Error descargando {slug}: {e}")
+        if throttle:
+            throttle.observe(None)
+        return None
 
-def fetch_all_company_names(slugs, batch_size=10, delay=1.0):
-    """Obtiene nombres reales de empresas en lotes"""
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-    })
+    if throttle:
+        throttle.observe(response)
+    if response.status_code != 200:
+        return None
+    return response.content
 
-    empresas = []
-    total = len(slugs)
 
-    for i, slug in enumerate(slugs, 1):
-        name = fetch_company_name(slug, session)
-        if not name:
-            name = slug_to_name(slug)
+def fetch_company_name(slug, transport, throttle=None):
+    """Obtiene el nombre real de la empresa desde su página usando JSON-LD"""
+    content = fetch_company_page(slug, transport, throttle)
+    return resolve_company_name(content) if content else None
 
-        empresas.append((slug, name))
 
-        if i % 20 == 0:
-            logger.info(f"Progreso: {i}/{total} empresas procesadas")
+def _crawl_companies(slugs, handle, workers, throttle):
+    """Aplica `handle(slug, transport, throttle)` a cada slug con un pool de hilos, en orden"""
+    transport = HttpTransport(pool_size=workers)
+    throttle = throttle or AdaptiveThrottle(rate=2.0)
+    total = len(slugs)
 
-        if i % batch_size == 0:
-            time.sleep(delay)
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(handle, slug, transport, throttle) for slug in slugs]
+        for i, future in enumerate(futures, 1):
+            results.append(future.result())
+            if i % 20 == 0:
+                logger.info(f"Progreso: {i}/{total} empresas procesadas (ritmo {throttle.rate:.2f} req/s)")
+    logger.info(f"Tráfico HTTP: {transport.metrics()}")
+    return results
+
+
+def fetch_all_company_names(slugs, workers=4, throttle=None, slug_cache=None):
+    """Obtiene nombres reales de empresas con un pool de hilos y ritmo adaptativo
+
+    Con slug_cache solo se descargan los slugs sin nombre real resuelto; los
+    nombres nuevos se guardan en la cache.
+    """
+    def handle(slug, transport, throttle):
+        name = fetch_company_name(slug, transport, throttle)
+        if name and slug_cache:
+            slug_cache.put(slug, name)
+        return (slug, name or slug_to_name(slug))
+
+    if slug_cache is None:
+        return _crawl_companies(slugs, handle, workers, throttle)
+
+    pending = slug_cache.unresolved(slugs)
+    logger.info(f"{len(slugs) - len(pending)} nombres en cache, {len(pending)} por resolver")
+    fetched = dict(_crawl_companies(pending, handle, workers, throttle)) if pending else {}
+    known = slug_cache.names()
+    return [(slug, fetched.get(slug) or known.get(slug) or slug_to_name(slug)) for slug in slugs]
+
+
+def fetch_companies_with_data(slugs, workers=4, throttle=None, on_records=None, slug_cache=None):
+    """Resuelve el nombre y extrae los puestos de cada empresa con una sola descarga
+
+    Retorna la lista de (slug, nombre). Los registros de cada empresa se entregan
+    a `on_records(records)` a medida que se completan (en el orden de `slugs`).
+    """
+    from scraper_simple import SalariosScraperSimple
+
+    # Un parser por hilo: parse_company_page guarda estado (extraction_method) en la instancia
+    local = threading.local()
+
+    def parser():
+        if not hasattr(local, 'parser'):
+            local.parser = SalariosScraperSimple(delay=0)
+        return local.parser
+
+    def handle(slug, transport, throttle):
+        content = fetch_company_page(slug, transport, throttle)
+        if content is None:
+            return (slug, slug_to_name(slug)), []
+        name = resolve_company_name(content)
+        if name and slug_cache:
+            slug_cache.put(slug, name)
+        name = name or slug_to_name(slug)
+        return (slug, name), parser().parse_company_page(content, name, company_url(slug))
 
+    empresas = []
+    for empresa, records in _crawl_companies(slugs, handle, workers, throttle):
+        empresas.append(empresa)
+        if on_records:
+            on_records(records)
     return empresas
 
 
 def generate_empresas_auto(empresas):
-    """Genera el archivo empresas_auto.py con la lista actualizada"""
-    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    tildes_count = len([e for e in empresas if any(c in e[0] for c in 'áéíóúñ%')])
-
-    lines = [
-        '#!/usr/bin/env python3',
-        '"""',
-        f'Lista de empresas extraída automáticamente desde SalariosPerú.com',
-        f'Generado automáticamente el {now}',
-        f'Total de empresas: {len(empresas)}',
-        f'Empresas con tildes/caracteres especiales: {tildes_count}',
-        '"""',
-        '',
-        '# Lista completa de empresas (slug, nombre)',
-        'EMPRESAS_AUTO = [',
-    ]
-
-    for slug, name in sorted(empresas, key=lambda x: x[1].lower()):
-        # Escapar comillas simples en nombres
-        escaped_name = name.replace("'", "\\'")
-        escaped_slug = slug.replace("'", "\\'")
-        lines.append(f"    ('{escaped_slug}', '{escaped_name}'),")
-
-    lines.extend([
-        ']',
-        '',
-        '',
-        'def get_empresas_auto():',
-        '    """Retorna la lista completa de empresas"""',
-        '    return EMPRESAS_AUTO',
-        '',
-        '',
-        'def get_empresas_con_tildes():',
-        '    """Retorna solo empresas con tildes"""',
-        '    return [e for e in EMPRESAS_AUTO if any(char in e[0] for char in \'áéíóúñ\')]',
-        '',
-        '',
-        'def print_summary():',
-        '    """Imprime resumen de empresas"""',
-        '    print(f"Total de empresas: {len(EMPRESAS_AUTO)}")',
-        '    empresas_tildes = get_empresas_con_tildes()',
-        '    print(f"Empresas con tildes: {len(empresas_tildes)}")',
-        '',
-        '    print("\\nEmpresas con caracteres especiales:")',
-        '    for slug, nombre in empresas_tildes:',
-        '        print(f"  • {nombre} ({slug})")',
-        '',
-        '',
-        'if __name__ == "__main__":',
-        '    print_summary()',
-        '',
-    ])
-
-    with open('empresas_auto.py', 'w', encoding='utf-8') as f:
-        f.write('\n'.join(lines))
-
-    logger.info(f"Archivo empresas_auto.py generado con {len(empresas)} empresas")
+    """Escribe el registro de empresas (empresas.json) con la lista actualizada"""
+    tildes_count = len([e for e in empresas if has_special_chars(e[0])])
+    total = write_registry(empresas)
+    logger.info(f"Registro {REGISTRY_PATH} generado con {total} empresas "
+                f"({tildes_count} con tildes/caracteres especiales)")
+    return total
 
 
 def main():
@@ -188,22 +178,41 @@ def main():
 
     # Verificar si el usuario quiere obtener nombres reales (lento)
     fetch_names = '--fetch-names' in sys.argv
+    with_data = '--with-data' in sys.argv
     quick = '--quick' in sys.argv
-
-    if fetch_names and not quick:
-        print("\n Obteniendo nombres reales de empresas (esto puede tardar)...")
-        empresas = fetch_all_company_names(slugs, batch_size=5, delay=1.5)
+    workers = 4
+    for arg in sys.argv:
+        if arg.startswith('--workers='):
+            try:
+                workers = int(arg.split('=')[1])
+            except ValueError:
+                pass
+
+    if with_data and not quick:
+        # Una sola descarga por empresa: nombre real + puestos
+        from scraper_simple import build_sinks
+
+        print(f"\n Obteniendo nombres reales y salarios ({workers} hilos)...")
+        with build_sinks('completo') as sinks:
+            empresas = fetch_companies_with_data(slugs, workers=workers, on_records=sinks.write,
+                                                 slug_cache=SlugCache())
+        print(f" {sinks.count} registros guardados en salarios_completo.csv / salarios_completo.db")
+    elif fetch_names and not quick:
+        print(f"\n Obteniendo nombres reales de empresas ({workers} hilos)...")
+        empresas = fetch_all_company_names(slugs, workers=workers, slug_cache=SlugCache())
     else:
-        print("\n Usando nombres derivados de slugs (usa --fetch-names para nombres reales)")
-        empresas = [(slug, slug_to_name(slug)) for slug in slugs]
+        print("\n Usando nombres derivados de slugs o ya resueltos (usa --fetch-names para nombres reales)")
+        known = SlugCache().names()
+        empresas = [(slug, known.get(slug) or slug_to_name(slug)) for slug in slugs]
 
     # Paso 2: Generar archivo
-    generate_empresas_auto(empresas)
+    total = generate_empresas_auto(empresas)
 
-    print(f"\n empresas_auto.py actualizado con {len(empresas)} empresas")
+    print(f"\n empresas.json actualizado con {total} empresas")
     print(f"\nUso:")
     print(f"  python update_empresas.py              # Rápido (nombres de slugs)")
     print(f"  python update_empresas.py --fetch-names # Lento (nombres reales del sitio)")
+    print(f"  python update_empresas.py --with-data   # Nombres reales + salarios en una pasada")
 
 
 if __name__ == "__main__":